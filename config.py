@@ -16,6 +16,28 @@ class Config:
     OLLAMA_URL = os.getenv("OLLAMA_URL")
     OLLAMA_MODEL_DEFAULT = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
     OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "120"))
+    # Seconds to wait for the TCP connection; OLLAMA_TIMEOUT then bounds each read
+    OLLAMA_CONNECT_TIMEOUT = int(os.getenv("OLLAMA_CONNECT_TIMEOUT", "10"))
+
+    # Upper bound on concurrent generate calls (match the server's OLLAMA_NUM_PARALLEL)
+    OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+    # Gzip request bodies above 4 KB; only for proxies in front of Ollama that
+    # accept Content-Encoding: gzip (Ollama itself does not decompress requests)
+    OLLAMA_COMPRESS_REQUESTS = os.getenv("OLLAMA_COMPRESS_REQUESTS", "false").lower() == "true"
+
+    # Response cache for repeated prompts (forces temperature 0 when enabled)
+    OLLAMA_CACHE_ENABLED = os.getenv("OLLAMA_CACHE", "false").lower() == "true"
+
+    # Keep the model loaded between calls, and size the context window so the
+    # long memo prompts are not silently truncated
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+    OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", "2048"))
+
+    # Embedding model for retrieving similar past risk acceptances (e.g.
+    # nomic-embed-text); retrieval is off when unset
+    OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "")
 
     # Available Models on VPS
     AVAILABLE_MODELS = [
@@ -32,6 +54,9 @@ class Config:
     HISTORY_DIR = BASE_DIR / "history"
     OUTPUTS_DIR = BASE_DIR / "outputs"
     LOGS_DIR = BASE_DIR / "logs"
+    LLM_CACHE_DIR = HISTORY_DIR / "llm_cache"
+    ACCEPTANCES_DIR = DATA_DIR / "acceptances"
+    EMBEDDINGS_DIR = DATA_DIR / "embeddings"
 
     # File Paths
     VENDOR_DB_PATH = DATA_DIR / "vendors.json"
@@ -53,13 +78,19 @@ class Config:
     DEFAULT_OUTPUT_FORMAT = os.getenv("DEFAULT_OUTPUT_FORMAT", "excel")
     DEFAULT_AUDIENCE = os.getenv("DEFAULT_AUDIENCE", "internal")
 
+    _dirs_ready = False
+
     @classmethod
     def ensure_directories(cls):
-        """Create necessary directories if they don't exist"""
-        cls.DATA_DIR.mkdir(exist_ok=True)
-        cls.HISTORY_DIR.mkdir(exist_ok=True)
-        cls.OUTPUTS_DIR.mkdir(exist_ok=True)
-        cls.LOGS_DIR.mkdir(exist_ok=True)
+        """Create necessary directories if they don't exist (once per process)"""
+        if cls._dirs_ready:
+            return
+
+        for directory in (cls.DATA_DIR, cls.HISTORY_DIR, cls.OUTPUTS_DIR, cls.LOGS_DIR):
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+
+        cls._dirs_ready = True
 
     @classmethod
     def validate_config(cls):
@@ -3,6 +3,8 @@ AI-Powered TPRM System - Interactive Dashboard
 Real-time vendor risk analytics and portfolio insights using Streamlit
 """
 import json
+import os
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -11,6 +13,11 @@ from pathlib import Path
 from datetime import datetime
 from config import Config
 
+try:
+    import orjson  # Optional: C JSON parser for large vendor databases
+except ImportError:
+    orjson = None
+
 # Page configuration
 st.set_page_config(
     page_title="TPRM Dashboard",
@@ -47,45 +54,147 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# DataFrame column -> (vendor record key, default)
+VENDOR_FIELDS = {
+    'Service': ('service', 'N/A'),
+    'Business Owner': ('business_owner', 'N/A'),
+    'Assessment Date': ('assessment_date', 'N/A'),
+    'Weighted Score': ('weighted_score', 0),
+    'Risk Level': ('risk_level', 'Unknown'),
+    'Risk Bucket': ('risk_bucket', 'Unknown'),
+    'Likelihood': ('likelihood', 'Unknown'),
+    'Impact': ('impact', 'Unknown'),
+    'Regulator': ('regulator', 'N/A'),
+    'Assessed By': ('assessed_by', 'N/A'),
+    'Composite Score': ('composite_pct_score', 0),
+}
+
+# Columnar snapshot of vendors.json; its mtime is pinned to the JSON file it was built from
+VENDOR_PARQUET_PATH = Config.DATA_DIR / "vendors.parquet"
+
+# Above this many dated assessments the timeline plots weekly aggregates
+TIMELINE_AGGREGATE_THRESHOLD = 500
+
+# Low-cardinality columns stored as pandas categoricals for cheap filtering
+CATEGORY_COLUMNS = ['Organization', 'Risk Level', 'Service']
+
+
+def _categorize(df):
+    """Cast filterable columns to category dtype"""
+    return df.astype({col: 'category' for col in CATEGORY_COLUMNS})
+
+
 @st.cache_data
 def load_vendor_data():
-    """Load and parse vendor data from JSON"""
+    """Load vendor data, preferring an up-to-date Parquet snapshot"""
     vendor_file = Config.VENDOR_DB_PATH
 
     if not vendor_file.exists():
         return pd.DataFrame()
 
-    with open(vendor_file, 'r') as f:
-        data = json.load(f)
-
-    # Flatten the nested structure
-    vendors = []
-    for org_id, org_vendors in data.items():
-        for vendor_name, vendor_info in org_vendors.items():
-            vendor_record = {
-                'Organization': org_id,
-                'Vendor': vendor_name,
-                'Service': vendor_info.get('service', 'N/A'),
-                'Business Owner': vendor_info.get('business_owner', 'N/A'),
-                'Assessment Date': vendor_info.get('assessment_date', 'N/A'),
-                'Weighted Score': vendor_info.get('weighted_score', 0),
-                'Risk Level': vendor_info.get('risk_level', 'Unknown'),
-                'Risk Bucket': vendor_info.get('risk_bucket', 'Unknown'),
-                'Likelihood': vendor_info.get('likelihood', 'Unknown'),
-                'Impact': vendor_info.get('impact', 'Unknown'),
-                'Regulator': vendor_info.get('regulator', 'N/A'),
-                'Assessed By': vendor_info.get('assessed_by', 'N/A'),
-                'Composite Score': vendor_info.get('composite_pct_score', 0)
-            }
-
-            # Add domain scores
-            if 'domains' in vendor_info:
-                for domain in vendor_info['domains']:
-                    vendor_record[f"{domain['name']} Score"] = domain['score']
-
-            vendors.append(vendor_record)
-
-    return pd.DataFrame(vendors)
+    source_stat = vendor_file.stat()
+
+    try:
+        if VENDOR_PARQUET_PATH.stat().st_mtime_ns == source_stat.st_mtime_ns:
+            return _categorize(pd.read_parquet(VENDOR_PARQUET_PATH, dtype_backend='pyarrow'))
+    except Exception:
+        pass  # Missing, stale or unreadable snapshot: rebuild from JSON
+
+    df = _flatten_vendor_json(vendor_file)
+
+    # Best effort: needs pyarrow, and mixed-type columns cannot be written
+    if not df.empty:
+        try:
+            df.to_parquet(VENDOR_PARQUET_PATH, compression='zstd', index=False)
+            os.utime(VENDOR_PARQUET_PATH, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        except Exception:
+            VENDOR_PARQUET_PATH.unlink(missing_ok=True)
+
+    return df
+
+
+def _flatten_vendor_json(vendor_file):
+    """Parse vendors.json into one row per vendor with domain score columns"""
+    with open(vendor_file, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+
+    # Flatten the nested structure in a single pass
+    rows = [
+        {
+            'Organization': org_id,
+            'Vendor': vendor_name,
+            **{col: vendor_info.get(key, default) for col, (key, default) in VENDOR_FIELDS.items()},
+            '__domains': vendor_info.get('domains') or [],
+        }
+        for org_id, org_vendors in data.items()
+        for vendor_name, vendor_info in org_vendors.items()
+    ]
+
+    if not rows:
+        return pd.DataFrame()
+
+    base = pd.DataFrame(rows)
+
+    # Pivot domain scores into "<Domain> Score" columns
+    dom = base[['Organization', 'Vendor', '__domains']].explode('__domains').dropna(subset=['__domains'])
+    base = base.drop(columns='__domains')
+
+    if dom.empty:
+        return _categorize(base)
+
+    scores = pd.json_normalize(dom['__domains'].tolist())[['name', 'score']]
+    scores['Organization'] = dom['Organization'].to_numpy()
+    scores['Vendor'] = dom['Vendor'].to_numpy()
+
+    wide = scores.pivot_table(
+        index=['Organization', 'Vendor'],
+        columns='name',
+        values='score',
+        aggfunc='last'
+    ).add_suffix(' Score')
+    wide.columns.name = None
+
+    return _categorize(base.merge(wide.reset_index(), on=['Organization', 'Vendor'], how='left'))
+
+
+@st.cache_data
+def _risk_lower(df):
+    """Lower-cased 'Risk Level' column, cached across reruns"""
+    return df['Risk Level'].str.lower()
+
+
+@st.cache_data
+def _unique(df, col):
+    """Distinct values of a column for filter widgets"""
+    return df[col].unique().tolist()
+
+
+@st.cache_data
+def _domain_avgs(df):
+    """Average score per control domain, sorted ascending"""
+    domain_cols = [col for col in df.columns if 'Score' in col and col not in ['Weighted Score', 'Composite Score']]
+
+    if not domain_cols:
+        return pd.DataFrame(columns=['Domain', 'Average Score'])
+
+    avgs = df[domain_cols].mean()
+    return pd.DataFrame({
+        'Domain': [col.replace(' Score', '') for col in domain_cols],
+        'Average Score': avgs.to_numpy()
+    }).sort_values('Average Score')
+
+
+@st.cache_data
+def _to_csv(df):
+    """Encode a DataFrame as CSV bytes for download"""
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def _category_mask(df, col, allowed):
+    """Boolean mask of rows whose categorical value is in allowed"""
+    allowed_codes = df[col].cat.categories.get_indexer(allowed)
+    return np.isin(df[col].cat.codes.to_numpy(), allowed_codes)
 
 
 def render_overview_metrics(df):
@@ -93,9 +202,10 @@ def render_overview_metrics(df):
     col1, col2, col3, col4 = st.columns(4)
 
     total_vendors = len(df)
-    high_risk = len(df[df['Risk Level'].str.lower() == 'high'])
-    medium_risk = len(df[df['Risk Level'].str.lower() == 'medium'])
-    low_risk = len(df[df['Risk Level'].str.lower() == 'low'])
+    risk_lower = _risk_lower(df)
+    high_risk = int((risk_lower == 'high').sum())
+    medium_risk = int((risk_lower == 'medium').sum())
+    low_risk = int((risk_lower == 'low').sum())
     avg_score = df['Weighted Score'].mean() if not df.empty else 0
 
     with col1:
@@ -170,19 +280,13 @@ def render_risk_heatmap(df):
         st.info("No vendor data available")
         return
 
-    # Create risk matrix data
-    likelihood_order = ['low', 'medium', 'high']
-    impact_order = ['low', 'medium', 'high']
-
-    # Count vendors in each cell
-    heatmap_data = []
-    for likelihood in likelihood_order:
-        row = []
-        for impact in impact_order:
-            count = len(df[(df['Likelihood'].str.lower() == likelihood) &
-                          (df['Impact'].str.lower() == impact)])
-            row.append(count)
-        heatmap_data.append(row)
+    # Count vendors in each likelihood/impact cell
+    levels = ['low', 'medium', 'high']
+    counts = pd.crosstab(
+        df['Likelihood'].str.lower(),
+        df['Impact'].str.lower()
+    ).reindex(index=levels, columns=levels, fill_value=0)
+    heatmap_data = counts.values.tolist()
 
     fig = go.Figure(data=go.Heatmap(
         z=heatmap_data,
@@ -213,22 +317,12 @@ def render_domain_scores(df):
         st.info("No vendor data available")
         return
 
-    # Get all domain score columns
-    domain_cols = [col for col in df.columns if 'Score' in col and col not in ['Weighted Score', 'Composite Score']]
+    domain_df = _domain_avgs(df)
 
-    if not domain_cols:
+    if domain_df.empty:
         st.warning("No domain scores available")
         return
 
-    # Calculate average scores per domain
-    domain_avgs = []
-    for col in domain_cols:
-        domain_name = col.replace(' Score', '')
-        avg_score = df[col].mean()
-        domain_avgs.append({'Domain': domain_name, 'Average Score': avg_score})
-
-    domain_df = pd.DataFrame(domain_avgs).sort_values('Average Score')
-
     fig = px.bar(
         domain_df,
         x='Average Score',
@@ -244,6 +338,27 @@ def render_domain_scores(df):
     st.plotly_chart(fig, use_container_width=True)
 
 
+@st.cache_data
+def _timeline_points(df):
+    """Dated assessments, binned by week once the portfolio gets large"""
+    dated = df.assign(**{
+        'Assessment Date': pd.to_datetime(df['Assessment Date'], errors='coerce')
+    }).dropna(subset=['Assessment Date'])
+
+    if len(dated) <= TIMELINE_AGGREGATE_THRESHOLD:
+        return dated.sort_values('Assessment Date'), False
+
+    weekly = dated.groupby(
+        [pd.Grouper(key='Assessment Date', freq='W'), 'Risk Level'],
+        observed=True
+    ).agg(**{
+        'Weighted Score': ('Weighted Score', 'mean'),
+        'Vendors': ('Vendor', 'size'),
+    }).reset_index()
+
+    return weekly, True
+
+
 def render_vendor_timeline(df):
     """Render vendor assessment timeline"""
     st.subheader("📅 Assessment Timeline")
@@ -252,26 +367,35 @@ def render_vendor_timeline(df):
         st.info("No vendor data available")
         return
 
-    # Convert dates and sort
-    df_timeline = df.copy()
-    df_timeline['Assessment Date'] = pd.to_datetime(df_timeline['Assessment Date'], errors='coerce')
-    df_timeline = df_timeline.dropna(subset=['Assessment Date'])
-    df_timeline = df_timeline.sort_values('Assessment Date')
+    df_timeline, aggregated = _timeline_points(df)
 
     if df_timeline.empty:
         st.warning("No valid assessment dates found")
         return
 
-    fig = px.scatter(
-        df_timeline,
-        x='Assessment Date',
-        y='Weighted Score',
-        color='Risk Level',
-        size='Composite Score',
-        hover_data=['Vendor', 'Organization', 'Service'],
-        title='Vendor Assessments Over Time',
-        color_discrete_map={'Low': '#4caf50', 'Medium': '#ff9800', 'High': '#f44336'}
-    )
+    color_map = {'Low': '#4caf50', 'Medium': '#ff9800', 'High': '#f44336'}
+
+    if aggregated:
+        fig = px.scatter(
+            df_timeline,
+            x='Assessment Date',
+            y='Weighted Score',
+            color='Risk Level',
+            size='Vendors',
+            title='Weekly Average Score by Risk Level',
+            color_discrete_map=color_map
+        )
+    else:
+        fig = px.scatter(
+            df_timeline,
+            x='Assessment Date',
+            y='Weighted Score',
+            color='Risk Level',
+            size='Composite Score',
+            hover_data=['Vendor', 'Organization', 'Service'],
+            title='Vendor Assessments Over Time',
+            color_discrete_map=color_map
+        )
 
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
@@ -285,13 +409,16 @@ def render_organization_comparison(df):
         st.info("No vendor data available")
         return
 
-    org_stats = df.groupby('Organization').agg({
-        'Vendor': 'count',
-        'Weighted Score': 'mean',
-        'Risk Level': lambda x: (x.str.lower() == 'high').sum()
-    }).reset_index()
-
-    org_stats.columns = ['Organization', 'Total Vendors', 'Avg Score', 'High Risk Count']
+    org_stats = (
+        df.assign(_is_high=_risk_lower(df).eq('high'))
+        .groupby('Organization', observed=True)
+        .agg(**{
+            'Total Vendors': ('Vendor', 'count'),
+            'Avg Score': ('Weighted Score', 'mean'),
+            'High Risk Count': ('_is_high', 'sum'),
+        })
+        .reset_index()
+    )
 
     fig = go.Figure()
 
@@ -323,8 +450,9 @@ def render_organization_comparison(df):
     st.plotly_chart(fig, use_container_width=True)
 
 
+@st.fragment
 def render_vendor_table(df):
-    """Render detailed vendor table"""
+    """Render detailed vendor table (reruns on its own when filters change)"""
     st.subheader("📋 Vendor Portfolio")
 
     if df.empty:
@@ -337,29 +465,29 @@ def render_vendor_table(df):
     with col1:
         org_filter = st.multiselect(
             'Filter by Organization',
-            options=df['Organization'].unique(),
-            default=df['Organization'].unique()
+            options=_unique(df, 'Organization'),
+            default=_unique(df, 'Organization')
         )
 
     with col2:
         risk_filter = st.multiselect(
             'Filter by Risk Level',
-            options=df['Risk Level'].unique(),
-            default=df['Risk Level'].unique()
+            options=_unique(df, 'Risk Level'),
+            default=_unique(df, 'Risk Level')
         )
 
     with col3:
         service_filter = st.multiselect(
             'Filter by Service',
-            options=df['Service'].unique(),
-            default=df['Service'].unique()
+            options=_unique(df, 'Service'),
+            default=_unique(df, 'Service')
         )
 
     # Apply filters
     filtered_df = df[
-        (df['Organization'].isin(org_filter)) &
-        (df['Risk Level'].isin(risk_filter)) &
-        (df['Service'].isin(service_filter))
+        _category_mask(df, 'Organization', org_filter) &
+        _category_mask(df, 'Risk Level', risk_filter) &
+        _category_mask(df, 'Service', service_filter)
     ]
 
     # Display table
@@ -385,7 +513,7 @@ def render_vendor_table(df):
 
     # Export button
     if not filtered_df.empty:
-        csv = filtered_df.to_csv(index=False)
+        csv = _to_csv(filtered_df)
         st.download_button(
             label="📥 Download as CSV",
             data=csv,
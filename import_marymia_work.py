@@ -18,10 +18,16 @@ Author: Adedeji Ikuomola
 Date: 2025-11-05
 """
 
+import errno
 import os
+import re
 import shutil
 import json
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # Paths
@@ -30,20 +36,156 @@ OUTPUTS_DIR = Path("outputs/marymia_ltd")
 DATA_DIR = Path("data")
 HISTORY_DIR = Path("history")
 
-# MaryMia Ltd deliverable files mapping
-DELIVERABLES = {
-    "vendor_inventory": "Vendor inventory draft compiled.xlsx",
-    "ddq_scoring": "MarymiaLtd_Robust_DDQ_Weighted_Scoring.xlsx",
-    "risk_treatment": "MarymiaLtd_Vendor_Risk_Treatment_Plan.xlsx",
-    "risk_treatment_pdf": "MarymiaLtd_Vendor_Risk_Treatment_Plan.pdf",
-    "contract_review": "MarymiaLtd_Contract_Clause_Review.xlsx",
-    "continuous_monitoring": "MarymiaLtd ContinuousMonitoring.xlsx",
-    "incident_pack": "MarymiaLtd Incident_Pack.xlsx",
-    "audit_readiness": "MarymiaLtd AuditReadiness.xlsx",
-    "executive_summary": "MarymiaLtd_Executive_Summary.pdf",
-    "vendor_comms": "Vendor Communication.docx",
-    "risk_classification": "Vendor Risk Classification Rules.docx",
-}
+# MaryMia Ltd deliverables and the outputs subdirectory each one is filed under
+DELIVERABLES = [
+    ("Vendor inventory draft compiled.xlsx", "assessments"),
+    ("MarymiaLtd_Robust_DDQ_Weighted_Scoring.xlsx", "assessments"),
+    ("MarymiaLtd_Vendor_Risk_Treatment_Plan.xlsx", "reports"),
+    ("MarymiaLtd_Vendor_Risk_Treatment_Plan.pdf", "reports"),
+    ("MarymiaLtd_Contract_Clause_Review.xlsx", "compliance"),
+    ("MarymiaLtd ContinuousMonitoring.xlsx", "reports"),
+    ("MarymiaLtd Incident_Pack.xlsx", "compliance"),
+    ("MarymiaLtd AuditReadiness.xlsx", "compliance"),
+    ("MarymiaLtd_Executive_Summary.pdf", "reports"),
+    ("Vendor Communication.docx", "communications"),
+    ("Vendor Risk Classification Rules.docx", "compliance"),
+]
+
+# (filename, subdirectory, destination path str), built once at import; the
+# copy helpers take plain strings so no Path objects are created per file
+DELIVERABLES_TABLE = [
+    (filename, subdirectory, os.fspath(OUTPUTS_DIR / subdirectory / filename))
+    for filename, subdirectory in DELIVERABLES
+]
+
+BANNER = "\n".join([
+    "\n" + "=" * 70,
+    "MARYMIA LTD TPRM WORK IMPORT TOOL",
+    "=" * 70,
+    "\nImporting completed Third-Party Risk Management deliverables",
+    "from thirdpartyrisk/ into the AI-Powered TPRM System...",
+])
+
+# Main README heading the MaryMia section is inserted in front of
+SUPPORT_HEADING = re.compile(r"^## Support\b", re.MULTILINE)
+
+# Bytes per sendfile() call
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Concurrent copies; threads release the GIL while blocked on file I/O
+COPY_WORKERS = 8
+
+
+# xattr errors that mean "not supported here", ignored as shutil._copyxattr does
+XATTR_IGNORED_ERRNOS = (errno.ENOTSUP, errno.ENODATA, errno.EINVAL, errno.EPERM)
+
+
+def _copy_xattrs(src_fd, dst_fd):
+    """Copy extended attributes between open files, if the source has any.
+
+    Best effort: attributes the destination filesystem rejects are skipped,
+    so a metadata copy never fails the file copy.
+    """
+    try:
+        names = os.listxattr(src_fd)
+    except OSError as e:
+        if e.errno in XATTR_IGNORED_ERRNOS:
+            return
+        raise
+    for name in names:
+        try:
+            os.setxattr(dst_fd, name, os.getxattr(src_fd, name))
+        except OSError as e:
+            # e.g. security.* attributes (EPERM) or no xattr support on dest
+            if e.errno not in XATTR_IGNORED_ERRNOS:
+                raise
+
+
+def _sendfile_copy(source_path, dest_path, source_stat=None):
+    """Copy file contents in-kernel with os.sendfile (Linux).
+
+    Mode, timestamps and extended attributes are applied through the
+    still-open descriptors, using source_stat when given.
+    """
+    src_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, COPY_CHUNK_SIZE)
+                if sent == 0:
+                    break
+                offset += sent
+
+            st = source_stat if source_stat is not None else os.fstat(src_fd)
+            _copy_xattrs(src_fd, dst_fd)
+            os.fchmod(dst_fd, stat.S_IMODE(st.st_mode))
+            os.utime(dst_fd, ns=(st.st_atime_ns, st.st_mtime_ns))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def fast_copy(source_path, dest_path, source_stat=None):
+    """Copy a file and its metadata like shutil.copy2, without Python-level buffering.
+
+    When source_stat (e.g. from a cached os.DirEntry) is given, mode and
+    timestamps are applied from it instead of re-statting the source.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            _sendfile_copy(source_path, dest_path, source_stat)
+            return
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL):
+                raise
+            shutil.copyfile(source_path, dest_path)
+    else:
+        # shutil.copyfile already uses fcopyfile on macOS and large buffers on Windows
+        shutil.copyfile(source_path, dest_path)
+
+    if source_stat is None:
+        shutil.copystat(source_path, dest_path)
+    else:
+        os.chmod(dest_path, stat.S_IMODE(source_stat.st_mode))
+        os.utime(dest_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+
+
+def atomic_write(path, data):
+    """Write data (str or bytes) to path via a temp file and os.replace.
+
+    Readers see either the old file or the complete new one, never a
+    partially written file.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    if os.name == "posix":
+        # Persist the rename itself
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+@lru_cache(maxsize=None)
+def _subdirectories(parent):
+    """Names of the directories directly under parent (one scandir per parent)."""
+    try:
+        with os.scandir(parent) as it:
+            return frozenset(entry.name for entry in it if entry.is_dir())
+    except FileNotFoundError:
+        return frozenset()
 
 
 def create_directory_structure():
@@ -60,62 +202,79 @@ def create_directory_structure():
         HISTORY_DIR,
     ]
 
+    # Create shallowest first so each child only needs a single mkdir once
+    # its parent is known to exist; existing ones are skipped via one cached
+    # scandir per parent instead of a stat per directory
+    _subdirectories.cache_clear()
+    created = {Path(".")}
+    for directory in sorted(directories, key=lambda d: len(d.parts)):
+        if directory.name not in _subdirectories(os.fspath(directory.parent)):
+            if directory.parent in created:
+                try:
+                    os.mkdir(directory)
+                except FileExistsError:
+                    pass
+            else:
+                directory.mkdir(parents=True, exist_ok=True)
+        created.add(directory)
+
     for directory in directories:
-        directory.mkdir(parents=True, exist_ok=True)
         print(f"    ✓ {directory}")
 
 
 def copy_deliverables():
-    """Copy all MaryMia Ltd deliverables to the outputs directory."""
-    print("\n[*] Copying MaryMia Ltd deliverables...")
+    """Copy all MaryMia Ltd deliverables to the outputs directory.
 
-    # Mapping deliverables to subdirectories
-    file_mappings = {
-        "vendor_inventory": "assessments",
-        "ddq_scoring": "assessments",
-        "risk_treatment": "reports",
-        "risk_treatment_pdf": "reports",
-        "contract_review": "compliance",
-        "continuous_monitoring": "reports",
-        "incident_pack": "compliance",
-        "audit_readiness": "compliance",
-        "executive_summary": "reports",
-        "vendor_comms": "communications",
-        "risk_classification": "compliance",
-    }
+    Returns (name, category, path) tuples for the files copied; they are
+    expanded into metadata dicts only when the metadata is written.
+    """
+    print("\n[*] Copying MaryMia Ltd deliverables...")
 
     copied_files = []
 
-    for key, filename in DELIVERABLES.items():
-        source_path = SOURCE_DIR / filename
-        subdirectory = file_mappings.get(key, "reports")
-        dest_path = OUTPUTS_DIR / subdirectory / filename
-
-        if source_path.exists():
-            shutil.copy2(source_path, dest_path)
+    # One directory scan; DirEntry caches the stat data used below
+    try:
+        with os.scandir(SOURCE_DIR) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        entries = {}
+
+    # Submit every copy up front so their I/O overlaps
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        jobs = []
+        for filename, subdirectory, dest_path in DELIVERABLES_TABLE:
+            entry = entries.get(filename)
+            future = None
+            if entry is not None and entry.is_file():
+                future = executor.submit(fast_copy, entry.path, dest_path, entry.stat())
+            jobs.append((filename, subdirectory, dest_path, future))
+
+        # Report in deliverable order; result() re-raises any copy error
+        for filename, subdirectory, dest_path, future in jobs:
+            if future is None:
+                print(f"    ✗ {filename} (not found)")
+                continue
+
+            future.result()
             print(f"    ✓ {filename} → {subdirectory}/")
-            copied_files.append({
-                "name": filename,
-                "category": subdirectory,
-                "path": str(dest_path),
-                "imported_at": datetime.now().isoformat()
-            })
-        else:
-            print(f"    ✗ {filename} (not found)")
+            copied_files.append((filename, subdirectory, dest_path))
 
     return copied_files
 
 
-def create_import_metadata(copied_files):
+def create_import_metadata(copied_files, import_iso):
     """Create metadata file documenting the import."""
     print("\n[*] Creating import metadata...")
 
     metadata = {
         "organization": "Marymia Ltd",
-        "import_date": datetime.now().isoformat(),
+        "import_date": import_iso,
         "import_source": "thirdpartyrisk/",
         "deliverables_count": len(copied_files),
-        "deliverables": copied_files,
+        "deliverables": [
+            {"name": name, "category": category, "path": path, "imported_at": import_iso}
+            for name, category, path in copied_files
+        ],
         "methodology": {
             "framework": "ISO 27001 (Annex A.15 & A.16)",
             "regulations": ["GDPR"],
@@ -143,14 +302,14 @@ def create_import_metadata(copied_files):
     }
 
     metadata_path = OUTPUTS_DIR / "import_metadata.json"
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    atomic_write(metadata_path, json.dumps(metadata, indent=2))
 
     print(f"    ✓ Metadata saved to {metadata_path}")
+
     return metadata
 
 
-def create_marymia_readme():
+def create_marymia_readme(import_date):
     """Create a README for the MaryMia Ltd imported work."""
     print("\n[*] Creating MaryMia Ltd documentation...")
 
@@ -265,8 +424,7 @@ For questions about this engagement or deliverables:
 """
 
     readme_path = OUTPUTS_DIR / "README.md"
-    with open(readme_path, 'w') as f:
-        f.write(readme_content.format(import_date=datetime.now().strftime("%Y-%m-%d")))
+    atomic_write(readme_path, readme_content.format(import_date=import_date))
 
     print(f"    ✓ README saved to {readme_path}")
 
@@ -281,8 +439,7 @@ def update_main_readme():
         print("    ✗ Main README not found")
         return
 
-    with open(main_readme_path, 'r') as f:
-        content = f.read()
+    content = main_readme_path.read_text(encoding="utf-8")
 
     # Check if already updated
     if "## MaryMia Ltd Engagement" in content:
@@ -311,71 +468,77 @@ posture with measurable reduction in residual risk.
 
 """
 
-    # Insert before "## Support" section
-    if "## Support" in content:
-        content = content.replace("## Support", new_section + "## Support")
-    else:
-        # Append at the end if no Support section
+    # Insert before the first "## Support" heading, or append if there is none
+    content, inserted = SUPPORT_HEADING.subn(
+        lambda match: new_section + match.group(0), content, count=1
+    )
+    if not inserted:
         content += "\n" + new_section
 
-    with open(main_readme_path, 'w') as f:
-        f.write(content)
+    atomic_write(main_readme_path, content)
 
     print("    ✓ Main README updated with MaryMia Ltd section")
 
 
 def print_summary(metadata):
     """Print import summary."""
-    print("\n" + "="*70)
-    print("IMPORT COMPLETE - MARYMIA LTD TPRM WORK")
-    print("="*70)
-    print(f"\n📁 Deliverables Imported: {metadata['deliverables_count']}")
-    print(f"📍 Location: {OUTPUTS_DIR}")
-    print(f"📅 Import Date: {metadata['import_date']}")
-    print(f"\n🎯 Engagement Details:")
-    print(f"   Organization: MaryMia Ltd")
-    print(f"   Analyst: {metadata['engagement_details']['analyst']}")
-    print(f"   Date: {metadata['engagement_details']['engagement_date']}")
-    print(f"   Outcome: {metadata['engagement_details']['outcome']}")
-    print(f"\n✓ Files organized by category:")
+    rule = "=" * 70
+    engagement = metadata['engagement_details']
 
     categories = {}
     for file_info in metadata['deliverables']:
-        category = file_info['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(file_info['name'])
+        categories.setdefault(file_info['category'], []).append(file_info['name'])
+
+    lines = [
+        "\n" + rule,
+        "IMPORT COMPLETE - MARYMIA LTD TPRM WORK",
+        rule,
+        f"\n📁 Deliverables Imported: {metadata['deliverables_count']}",
+        f"📍 Location: {OUTPUTS_DIR}",
+        f"📅 Import Date: {metadata['import_date']}",
+        "\n🎯 Engagement Details:",
+        "   Organization: MaryMia Ltd",
+        f"   Analyst: {engagement['analyst']}",
+        f"   Date: {engagement['engagement_date']}",
+        f"   Outcome: {engagement['outcome']}",
+        "\n✓ Files organized by category:",
+    ]
 
     for category, files in sorted(categories.items()):
-        print(f"\n   {category.upper()}:")
-        for filename in files:
-            print(f"      • {filename}")
+        lines.append(f"\n   {category.upper()}:")
+        lines.extend(f"      • {filename}" for filename in files)
+
+    lines += [
+        f"\n📖 Documentation: {OUTPUTS_DIR}/README.md",
+        f"📊 Metadata: {OUTPUTS_DIR}/import_metadata.json",
+        "\n" + rule,
+        "\nNext Steps:",
+        "1. Review imported deliverables in outputs/marymia_ltd/",
+        "2. Run 'python main.py' to access the TPRM system",
+        "3. Use 'Search & Filter' to view MaryMia Ltd vendor data",
+        "4. Launch dashboard with 'streamlit run dashboard.py'",
+        "\n" + rule + "\n",
+    ]
 
-    print(f"\n📖 Documentation: {OUTPUTS_DIR}/README.md")
-    print(f"📊 Metadata: {OUTPUTS_DIR}/import_metadata.json")
-    print("\n" + "="*70)
-    print("\nNext Steps:")
-    print("1. Review imported deliverables in outputs/marymia_ltd/")
-    print("2. Run 'python main.py' to access the TPRM system")
-    print("3. Use 'Search & Filter' to view MaryMia Ltd vendor data")
-    print("4. Launch dashboard with 'streamlit run dashboard.py'")
-    print("\n" + "="*70 + "\n")
+    # One write instead of a print() per line
+    print("\n".join(lines))
 
 
 def main():
     """Main import workflow."""
-    print("\n" + "="*70)
-    print("MARYMIA LTD TPRM WORK IMPORT TOOL")
-    print("="*70)
-    print("\nImporting completed Third-Party Risk Management deliverables")
-    print("from thirdpartyrisk/ into the AI-Powered TPRM System...")
+    print(BANNER)
+
+    # One timestamp for the whole import event
+    import_ts = datetime.now()
+    import_iso = import_ts.isoformat()
+    import_date = import_ts.strftime("%Y-%m-%d")
 
     try:
         # Execute import steps
         create_directory_structure()
         copied_files = copy_deliverables()
-        metadata = create_import_metadata(copied_files)
-        create_marymia_readme()
+        metadata = create_import_metadata(copied_files, import_iso)
+        create_marymia_readme(import_date)
         update_main_readme()
         print_summary(metadata)
 
@@ -4,14 +4,32 @@ Production-grade third-party risk management system
 """
 import importlib
 import sys
+import threading
 from pathlib import Path
 
 from config import Config
 from modules.logger import get_logger, TPRMLogger
-from modules.api_client import get_client, ConnectionError as OllamaConnectionError
-from modules.validators import InputValidator, ValidationError
 
-logger = get_logger(__name__)
+# Set up in main() so importing this module has no logging side effects
+logger = None
+
+# Menu dispatch table: choice -> (module, takes model name, description for errors)
+MENU_HANDLERS = {
+    "1": ("modules.tprm_ddq", True, "in assessment workflow"),
+    "2": ("modules.reports", True, "in portfolio/management report"),
+    "3": ("modules.search", True, "in vendor search/filter"),
+    "4": ("modules.register", False, "exporting risk register"),
+    "5": ("modules.acceptances", True, "generating risk acceptance memo"),
+    "6": ("modules.comms", True, "drafting communication"),
+    "7": ("modules.risk_treatment", True, "generating risk treatment summary"),
+    "8": ("modules.importer", False, "importing vendors from Excel"),
+    "9": ("modules.dashboard_launcher", False, "launching dashboard"),
+}
+
+# Menu modules, imported in the background once the menu is showing
+MENU_MODULES = tuple(name for name, _, _ in MENU_HANDLERS.values())
+
+_loaded_modules = {}
 
 def pick_model():
     """
@@ -61,65 +79,112 @@ def pick_model():
     return chosen
 
 
+def _import_menu_modules():
+    """Import every menu module not loaded yet; failures are left to get_module"""
+    for name in MENU_MODULES:
+        if name in _loaded_modules:
+            continue
+        try:
+            _loaded_modules[name] = importlib.import_module(name)
+        except Exception as e:
+            logger.debug(f"Could not preload {name}: {e}")
+
+
+def preload_modules():
+    """
+    Import the menu modules on a background thread
+
+    Called after the first menu render, so startup never waits on these
+    imports; they overlap with the user reading the menu instead. Modules
+    that fail to import are skipped here and retried (so the error is
+    reported) when the user selects them.
+    """
+    threading.Thread(target=_import_menu_modules, name="menu-preload", daemon=True).start()
+
+
+def get_module(name):
+    """Return a preloaded menu module, importing it on demand if needed"""
+    mod = _loaded_modules.get(name)
+    if mod is None:
+        mod = _loaded_modules[name] = importlib.import_module(name)
+    return mod
+
+
+# Static main menu, rendered once at import
+_MENU_STR = "\n".join([
+    "",
+    "=" * 60,
+    "  AI-POWERED TPRM SYSTEM - COMMAND CENTRE",
+    "=" * 60,
+    "",
+    "📋 CORE OPERATIONS:",
+    "  1. Vendor Assessment Workflow",
+    "     → New assessment | Edit existing | View portfolio",
+    "     → DDQ scoring (7 weighted domains)",
+    "     → Excel / PDF / Word / PowerPoint outputs",
+    "",
+    "  2. Portfolio / Management Reports",
+    "     → Organization-level or cross-org summaries",
+    "",
+    "  3. Search / Filter Vendors",
+    "     → Query vendors and open actions",
+    "",
+    "  4. Export Risk Register",
+    "     → Excel export per org or ALL",
+    "",
+    "",
+    "📄 DOCUMENTATION:",
+    "  5. Risk Acceptance Memo",
+    "     → Formal risk acceptance documentation",
+    "",
+    "  6. Stakeholder Communications",
+    "     → Draft vendor and stakeholder letters",
+    "",
+    "  7. Risk Treatment Summary",
+    "     → Board-level risk treatment reports",
+    "",
+    "",
+    "⚙️  UTILITIES:",
+    "  8. Import Vendors from Excel",
+    "     → Bulk vendor loading",
+    "",
+    "  9. Interactive Dashboard",
+    "     → Real-time risk analytics and visualizations",
+    "",
+    "  10. Continuous Monitoring (Coming Soon)",
+    "     → Automated watchlist tracking",
+    "",
+    "  11. Exit",
+    "",
+    "=" * 60,
+])
+
+
 def show_menu():
     """Display main menu with production formatting"""
-    print("\n" + "="*60)
-    print("  AI-POWERED TPRM SYSTEM - COMMAND CENTRE")
-    print("="*60)
-    print("\n📋 CORE OPERATIONS:")
-    print("  1. Vendor Assessment Workflow")
-    print("     → New assessment | Edit existing | View portfolio")
-    print("     → DDQ scoring (7 weighted domains)")
-    print("     → Excel / PDF / Word / PowerPoint outputs")
-    print()
-    print("  2. Portfolio / Management Reports")
-    print("     → Organization-level or cross-org summaries")
-    print()
-    print("  3. Search / Filter Vendors")
-    print("     → Query vendors and open actions")
-    print()
-    print("  4. Export Risk Register")
-    print("     → Excel export per org or ALL")
-    print()
-    print("\n📄 DOCUMENTATION:")
-    print("  5. Risk Acceptance Memo")
-    print("     → Formal risk acceptance documentation")
-    print()
-    print("  6. Stakeholder Communications")
-    print("     → Draft vendor and stakeholder letters")
-    print()
-    print("  7. Risk Treatment Summary")
-    print("     → Board-level risk treatment reports")
-    print()
-    print("\n⚙️  UTILITIES:")
-    print("  8. Import Vendors from Excel")
-    print("     → Bulk vendor loading")
-    print()
-    print("  9. Interactive Dashboard")
-    print("     → Real-time risk analytics and visualizations")
-    print()
-    print("  10. Continuous Monitoring (Coming Soon)")
-    print("     → Automated watchlist tracking")
-    print()
-    print("  11. Exit")
-    print("\n" + "="*60)
+    print(_MENU_STR)
 
 
 def main():
     """
     Main application entry point with production error handling
     """
+    global logger
+    logger = get_logger(__name__)
+
     try:
         # Display startup banner
-        print("\n" + "="*60)
-        print(f"  {Config.APP_NAME}")
-        print(f"  Version {Config.VERSION}")
-        print("="*60)
+        rule = "=" * 60
+        print(f"\n{rule}\n  {Config.APP_NAME}\n  Version {Config.VERSION}\n{rule}")
 
         logger.info("="*60)
         logger.info(f"Starting {Config.APP_NAME} v{Config.VERSION}")
         logger.info("="*60)
 
+        # Deferred until after the banner: these pull in requests and friends
+        from modules.api_client import get_client, ConnectionError as OllamaConnectionError
+        from modules.validators import InputValidator, ValidationError
+
         # Ensure directories exist
         Config.ensure_directories()
         logger.info("Initialized directory structure")
@@ -154,9 +219,14 @@ def main():
         model_name = pick_model()
 
         # Main application loop
+        preloading = False
         while True:
             show_menu()
 
+            if not preloading:
+                preload_modules()
+                preloading = True
+
             try:
                 choice = input("\n👉 Select option (1-11): ").strip()
             except EOFError:
@@ -182,85 +252,18 @@ def main():
             TPRMLogger.log_user_action(logger, f"menu_selection", {"choice": choice})
 
             # Execute menu option
-            if choice == "1":
-                try:
-                    mod = importlib.import_module("modules.tprm_ddq")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error in assessment workflow: {e}", exc_info=True)
-                    print(f"\n❌ Error in assessment workflow: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "2":
-                try:
-                    mod = importlib.import_module("modules.reports")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error in portfolio report: {e}", exc_info=True)
-                    print(f"\n❌ Error in portfolio/management report: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "3":
-                try:
-                    mod = importlib.import_module("modules.search")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error in vendor search: {e}", exc_info=True)
-                    print(f"\n❌ Error in vendor search/filter: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "4":
-                try:
-                    mod = importlib.import_module("modules.register")
-                    mod.run()
-                except Exception as e:
-                    logger.error(f"Error exporting risk register: {e}", exc_info=True)
-                    print(f"\n❌ Error exporting risk register: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "5":
-                try:
-                    mod = importlib.import_module("modules.acceptances")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error generating risk acceptance: {e}", exc_info=True)
-                    print(f"\n❌ Error generating risk acceptance memo: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "6":
-                try:
-                    mod = importlib.import_module("modules.comms")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error drafting communication: {e}", exc_info=True)
-                    print(f"\n❌ Error drafting communication: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "7":
-                try:
-                    mod = importlib.import_module("modules.risk_treatment")
-                    mod.run(model_name)
-                except Exception as e:
-                    logger.error(f"Error generating risk treatment: {e}", exc_info=True)
-                    print(f"\n❌ Error generating risk treatment summary: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "8":
-                try:
-                    mod = importlib.import_module("modules.importer")
-                    mod.run()
-                except Exception as e:
-                    logger.error(f"Error importing vendors: {e}", exc_info=True)
-                    print(f"\n❌ Error importing vendors from Excel: {e}")
-                    print("Check logs/tprm_system.log for details")
-
-            elif choice == "9":
+            handler = MENU_HANDLERS.get(choice)
+            if handler is not None:
+                name, needs_model, action = handler
                 try:
-                    mod = importlib.import_module("modules.dashboard_launcher")
-                    mod.run()
+                    mod = get_module(name)
+                    if needs_model:
+                        mod.run(model_name)
+                    else:
+                        mod.run()
                 except Exception as e:
-                    logger.error(f"Error launching dashboard: {e}", exc_info=True)
-                    print(f"\n❌ Error launching dashboard: {e}")
+                    logger.error(f"Error {action}: {e}", exc_info=True)
+                    print(f"\n❌ Error {action}: {e}")
                     print("Check logs/tprm_system.log for details")
 
             elif choice == "10":
@@ -1,73 +1,51 @@
 import datetime
+from string import Template
 from pathlib import Path
+from config import Config
 from . import utils
-from modules.api_client import ask_model
+from modules.api_client import APIError, ask_model_stream, get_client
+from modules.logger import get_logger
+from modules.validators import InputValidator, ValidationError
 
-def run(model_name):
-    print("\n=== Risk Acceptance / Exception Memo Generator ===\n")
-
-    db = utils.load_vendor_db()
-    if not db:
-        print("No vendors found in data/vendors.json yet.")
-        return
-
-    org_id = input("Which organisation / client? (exact name): ").strip()
-    if org_id not in db:
-        print(f"No records for org '{org_id}'.")
-        return
-
-    vendor_name = input("Which vendor? (exact name): ").strip()
-    if vendor_name not in db[org_id]:
-        print(f"Vendor '{vendor_name}' not found under org '{org_id}'.")
-        return
-
-    vendor_record = db[org_id][vendor_name]
+logger = get_logger(__name__)
 
-    # Sanity check: isolation
-    if vendor_record["org_id"] != org_id:
-        print("Data isolation check failed. Aborting.")
-        return
-
-    # Capture acceptance details
-    risk_desc = input("Describe the risk / gap being accepted: ").strip()
-    justification = input("Why are we accepting it (business justification)? ").strip()
-    owner = input("Who is the risk owner / approver (name/title)? ").strip()
-    expiry = input("When does this acceptance expire (YYYY-MM-DD)? ").strip()
-    mitigation_plan = input("Mitigation / compensating controls in place: ").strip()
+OUT_DIR = Path("outputs")
+OUT_DIR.mkdir(exist_ok=True)
 
-    audience, redaction = utils.ask_audience_and_redaction()
+# Number of similar past acceptances quoted in the prompt
+SIMILAR_ACCEPTANCES_TOP_K = 3
 
-    prompt = f"""
+ACCEPTANCE_PROMPT = Template("""
 You are a governance and risk officer.
 
 Write a formal Risk Acceptance / Risk Exception memo for one vendor, for one organisation.
 Do NOT reference any other organisation, business unit, or vendor.
 Assume this memo could be shown to auditors.
 
-Organisation / Client: {org_id}
-Vendor: {vendor_name}
-Service / data handled: {vendor_record['service']}
-Business owner / sponsor: {vendor_record['business_owner']}
-Overall control score: {vendor_record['overall_control_score']}/5
-Likelihood: {vendor_record['likelihood']}
-Impact: {vendor_record['impact']}
-Risk bucket: {vendor_record.get('risk_bucket', utils.classify_risk_bucket(vendor_record['likelihood'], vendor_record['impact']))}
+Organisation / Client: ${org_id}
+Vendor: ${vendor_name}
+Service / data handled: ${service}
+Business owner / sponsor: ${business_owner}
+Overall control score: ${overall_control_score}/5
+Likelihood: ${likelihood}
+Impact: ${impact}
+Risk bucket: ${risk_bucket}
 
 Risk / Gap being accepted:
-{risk_desc}
+${risk_desc}
 
 Business justification for accepting:
-{justification}
+${justification}
 
 Mitigation / Compensating controls in place:
-{mitigation_plan}
+${mitigation_plan}
 
 Risk owner / approver:
-{owner}
+${owner}
 
 Expiry / Review date:
-{expiry}
-
+${expiry}
+${similar_acceptances}
 Write the memo with these sections:
 1. Executive Summary
 2. Description of the Risk / Gap
@@ -79,18 +57,132 @@ Write the memo with these sections:
 8. Conditions for Ongoing Acceptance
 
 Tone requirements:
-- Audience type: {audience}
-- Redaction level: {redaction}
+- Audience type: ${audience}
+- Redaction level: ${redaction}
 If audience is 'exec', keep it business/impact focused.
 If audience is 'internal', you may include blunt framing of weakness.
 If audience is 'vendor', do NOT expose other internal weaknesses, only describe what we expect them to do.
 Do not mention any other clients or unrelated vendors.
-"""
+""")
+
+def _acceptance_embeddings(org_id, vendor_name, texts, model):
+    """
+    Embeddings for a vendor's past acceptance memos, cached on disk
+
+    The acceptance log is append-only, so cached rows stay valid and only
+    entries added since the last run are sent to the model.
+    """
+    import numpy as np
+
+    safe_name = InputValidator.sanitize_filename(
+        f"{org_id}_{vendor_name}_{model}".replace(" ", "_").replace(":", "-")
+    )
+    cache_path = Config.EMBEDDINGS_DIR / f"{safe_name}.npy"
+
+    cached = np.load(cache_path) if cache_path.exists() else np.empty((0, 0))
+    if len(cached) > len(texts):
+        cached = np.empty((0, 0))
+
+    new_texts = texts[len(cached):]
+    if not new_texts:
+        return cached
+
+    fresh = np.asarray(get_client().embed(model, new_texts), dtype=np.float32)
+    vectors = np.vstack([cached, fresh]) if len(cached) else fresh
+
+    Config.EMBEDDINGS_DIR.mkdir(parents=True, exist_ok=True)
+    np.save(cache_path, vectors)
+    return vectors
+
+def _similar_acceptances(org_id, vendor_name, vendor_record, risk_desc):
+    """Prompt section listing the past acceptances closest to risk_desc ('' if none)"""
+    model = Config.OLLAMA_EMBED_MODEL
+    if not model or not risk_desc:
+        return ""
+
+    past = utils.load_acceptances(org_id, vendor_name, vendor_record)
+    if not past:
+        return ""
+
+    try:
+        import numpy as np
+
+        vectors = _acceptance_embeddings(
+            org_id, vendor_name, [e.get("memo_text") or e.get("risk_desc", "") for e in past], model
+        )
+        query = np.asarray(get_client().embed(model, [risk_desc])[0], dtype=np.float32)
+    except (APIError, OSError, ValueError, ImportError) as e:
+        logger.warning(f"Skipping similar-acceptance retrieval: {e}")
+        return ""
+
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+    scores = (vectors @ query) / np.where(norms == 0, 1, norms)
+    top = np.argsort(scores)[::-1][:SIMILAR_ACCEPTANCES_TOP_K]
+
+    lines = [
+        f"- {past[i].get('generated_at', '')[:10]}: {past[i].get('risk_desc', '')} "
+        f"(owner: {past[i].get('owner', '')}, expiry: {past[i].get('expiry', '')})"
+        for i in top
+    ]
+    return (
+        "\nSimilar risks previously accepted for this vendor "
+        "(keep the new memo consistent with them; do not copy them):\n"
+        + "\n".join(lines) + "\n"
+    )
+
+def run(model_name):
+    print("\n=== Risk Acceptance / Exception Memo Generator ===\n")
+
+    db = utils.load_vendor_db()
+    if not db:
+        print("No vendors found in data/vendors.json yet.")
+        return
+
+    org_input = input("Which organisation / client? (exact name): ")
+    vendor_input = input("Which vendor? (exact name): ")
+    try:
+        # Case-insensitive lookup; also enforces the isolation check
+        org_id, vendor_name, vendor_record = utils.resolve(db, org_input, vendor_input)
+    except ValidationError as e:
+        print(e)
+        return
+
+    # Capture acceptance details
+    risk_desc = input("Describe the risk / gap being accepted: ").strip()
+    justification = input("Why are we accepting it (business justification)? ").strip()
+    owner = input("Who is the risk owner / approver (name/title)? ").strip()
+    expiry = input("When does this acceptance expire (YYYY-MM-DD)? ").strip()
+    mitigation_plan = input("Mitigation / compensating controls in place: ").strip()
+
+    audience, redaction = utils.ask_audience_and_redaction()
+
+    # Ask everything up front so nothing waits on the user once generation starts
+    save_word = input("Also save as Word (.docx)? (y/n): ").strip().lower()
+
+    prompt = ACCEPTANCE_PROMPT.substitute(
+        org_id=org_id,
+        vendor_name=vendor_name,
+        service=vendor_record['service'],
+        business_owner=vendor_record['business_owner'],
+        overall_control_score=vendor_record['overall_control_score'],
+        likelihood=vendor_record['likelihood'],
+        impact=vendor_record['impact'],
+        risk_bucket=vendor_record['risk_bucket'],
+        risk_desc=risk_desc,
+        justification=justification,
+        mitigation_plan=mitigation_plan,
+        owner=owner,
+        expiry=expiry,
+        audience=audience,
+        redaction=redaction,
+        similar_acceptances=_similar_acceptances(org_id, vendor_name, vendor_record, risk_desc),
+    )
 
     print("\n🤖 Generating Risk Acceptance memo with model:", model_name, "...\n")
-    memo_text = ask_model(model_name, prompt)
+    with utils.timed_model_call(logger, f"risk_acceptance/{model_name}"):
+        memo_text = utils.echo_stream(ask_model_stream(model_name, prompt))
 
-    # Append this acceptance into the vendor record for audit trail
+    # Record this acceptance in the vendor's audit trail
     acceptance_entry = {
         "risk_desc": risk_desc,
         "justification": justification,
@@ -101,36 +193,41 @@ Do not mention any other clients or unrelated vendors.
         "memo_text": memo_text
     }
 
+    utils.append_acceptance(org_id, vendor_name, acceptance_entry)
+
+    # The vendor record only keeps a pointer-sized summary of the log
     vr = db[org_id][vendor_name]
-    if "risk_acceptances" not in vr:
-        vr["risk_acceptances"] = []
-    vr["risk_acceptances"].append(acceptance_entry)
+    summary = vr.get("risk_acceptance_summary") or {"count": len(vr.get("risk_acceptances", []))}
+    vr["risk_acceptance_summary"] = {
+        "last_acceptance_at": acceptance_entry["generated_at"],
+        "count": summary["count"] + 1,
+    }
 
     # save updated db
     db[org_id][vendor_name] = vr
     utils.save_vendor_db(db)
 
-    # snapshot to history
-    utils.snapshot_history(org_id, vendor_name, vr)
+    # snapshot to history, with the full acceptance log so the audit trail
+    # does not depend on data/acceptances/ being kept alongside it
+    utils.snapshot_history(org_id, vendor_name, {
+        **vr, "risk_acceptances": utils.load_acceptances(org_id, vendor_name, vr)
+    })
 
     # export memo to outputs
     safe_org = org_id.replace(" ", "_")
     safe_vendor = vendor_name.replace(" ", "_")
     ts = utils.today_short()
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
+    out_dir = OUT_DIR
 
     # Save as .txt for guaranteed audit trail
     txt_path = out_dir / f"{safe_org}_{safe_vendor}_{ts}_risk_acceptance.txt"
     txt_path.write_text(memo_text, encoding="utf-8")
 
-    # Also offer Word
-    save_word = input("Also save as Word (.docx)? (y/n): ").strip().lower()
+    # Word copy, if requested up front
     if save_word == "y":
-        from docx import Document
-        doc = Document()
+        doc = utils.get_docx_document()()
         doc.add_heading(f"Risk Acceptance: {vendor_name} ({org_id})", 0)
-        doc.add_paragraph(memo_text)
+        utils.add_text_blocks(doc, memo_text)
         doc.save(out_dir / f"{safe_org}_{safe_vendor}_{ts}_risk_acceptance.docx")
         print("✅ .docx written.")
 
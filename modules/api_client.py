@@ -2,14 +2,28 @@
 Production-grade API client for Ollama with retry logic and error handling
 Provides reliable connection management and graceful degradation
 """
+import asyncio
+import atexit
+import gzip
+import json
+import random
+import threading
 import time
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Iterator, List
 from config import Config
 from modules.logger import get_logger, TPRMLogger
+from modules.llm_cache import LLMCache
 
 logger = get_logger(__name__)
 
+# Request bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 4096
+
+# Seconds a /api/tags model listing is reused by check_model_available()
+MODEL_LIST_TTL = 60
+
 class APIError(Exception):
     """Raised when API call fails"""
     pass
@@ -18,6 +32,96 @@ class ConnectionError(APIError):
     """Raised when connection to Ollama fails"""
     pass
 
+def _iter_stream_objects(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Parse an Ollama NDJSON stream, stopping after the final "done" object
+
+    Args:
+        response: Streaming response from /api/generate
+
+    Yields:
+        Decoded stream objects
+
+    Raises:
+        APIError: If the server reports an error mid-stream
+    """
+    for line in response.iter_lines():
+        if not line:
+            continue
+        obj = json.loads(line)
+        if obj.get("error"):
+            raise APIError(f"Ollama error: {obj['error']}")
+        yield obj
+        if obj.get("done"):
+            break
+
+def _accumulate_streaming_response(response: requests.Response) -> Dict[str, Any]:
+    """
+    Collect an Ollama NDJSON stream into a single result
+
+    Args:
+        response: Streaming response from /api/generate
+
+    Returns:
+        Final stream object with the concatenated text under "response"
+    """
+    chunks = []
+    final: Dict[str, Any] = {}
+
+    for obj in _iter_stream_objects(response):
+        chunks.append(obj.get("response", ""))
+        if obj.get("done"):
+            final = obj
+
+    final["response"] = "".join(chunks)
+    return final
+
+def _generate_payload(model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build a streaming /api/generate request body with the configured tuning
+
+    Args:
+        model: Model name to use
+        prompt: Prompt to send to model
+        options: Extra Ollama model options; these override the defaults
+
+    Returns:
+        Request payload
+    """
+    merged = {
+        "num_ctx": Config.OLLAMA_NUM_CTX,
+        "num_predict": Config.OLLAMA_NUM_PREDICT,
+    }
+    if options:
+        merged.update(options)
+
+    return {
+        "model": model,
+        "prompt": prompt,
+        "stream": True,
+        "keep_alive": Config.OLLAMA_KEEP_ALIVE,
+        "options": merged,
+    }
+
+def _encode_payload(payload: Dict[str, Any]) -> tuple:
+    """
+    Serialize a request payload, gzipping large bodies when enabled
+
+    Args:
+        payload: JSON-serializable request body
+
+    Returns:
+        Tuple of (body bytes, request headers)
+    """
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+
+    if Config.OLLAMA_COMPRESS_REQUESTS and len(body) > COMPRESS_MIN_BYTES:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return body, headers
+
 class OllamaClient:
     """Production-grade Ollama API client with retry logic"""
 
@@ -27,56 +131,92 @@ class OllamaClient:
 
         Args:
             url: Ollama API URL (defaults to config)
-            timeout: Request timeout in seconds (defaults to config)
+            timeout: Read timeout in seconds (defaults to config)
         """
         self.url = url or Config.OLLAMA_URL
         self.timeout = timeout or Config.OLLAMA_TIMEOUT
+        self.connect_timeout = min(Config.OLLAMA_CONNECT_TIMEOUT, self.timeout)
+        # (connect, read): an unreachable host fails fast, a slow generation does not
+        self.request_timeout = (self.connect_timeout, self.timeout)
         self._connection_verified = False
+        self._verify_lock = threading.Lock()
+        # (monotonic fetch time, installed model names) from the last /api/tags
+        self._model_list: Optional[tuple] = None
+
+        # Reuse pooled keep-alive connections instead of a fresh handshake per call.
+        # The pool must hold one connection per concurrent batch request, or
+        # urllib3 discards the surplus and they reconnect on every call.
+        # Retries are handled by generate(), so urllib3 retries are disabled.
+        self.session = requests.Session()
+        pool_size = max(10, Config.OLLAMA_NUM_PARALLEL)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    def close(self) -> None:
+        """Release pooled connections held by the session"""
+        self.session.close()
 
     def verify_connection(self) -> bool:
         """
         Verify connection to Ollama server
 
+        Only the first successful check hits the server; concurrent callers
+        wait on a lock instead of each issuing their own request.
+
         Returns:
             True if connection successful
 
         Raises:
             ConnectionError: If connection fails
         """
-        try:
-            # Try to connect to Ollama's tags endpoint
-            test_url = self.url.replace('/api/generate', '/api/tags')
-            response = requests.get(test_url, timeout=5)
-            response.raise_for_status()
-
-            self._connection_verified = True
-            logger.info(f"Successfully connected to Ollama at {self.url}")
+        if self._connection_verified:
             return True
 
-        except requests.exceptions.ConnectionError:
-            error_msg = (
-                f"Cannot connect to Ollama at {self.url}. "
-                "Please ensure Ollama is running (try 'ollama serve')."
-            )
-            logger.error(error_msg)
-            raise ConnectionError(error_msg)
+        with self._verify_lock:
+            if self._connection_verified:
+                return True
+
+            try:
+                # Try to connect to Ollama's tags endpoint
+                test_url = self.url.replace('/api/generate', '/api/tags')
+                response = self.session.get(test_url, timeout=5)
+                response.raise_for_status()
+                self._remember_models(response)
 
-        except requests.exceptions.Timeout:
-            error_msg = f"Connection to Ollama timed out at {self.url}"
-            logger.error(error_msg)
-            raise ConnectionError(error_msg)
+                self._connection_verified = True
+                logger.info(f"Successfully connected to Ollama at {self.url}")
+                return True
 
-        except Exception as e:
-            error_msg = f"Failed to connect to Ollama: {str(e)}"
-            logger.error(error_msg)
-            raise ConnectionError(error_msg)
+            except requests.exceptions.ConnectionError:
+                error_msg = (
+                    f"Cannot connect to Ollama at {self.url}. "
+                    "Please ensure Ollama is running (try 'ollama serve')."
+                )
+                logger.error(error_msg)
+                raise ConnectionError(error_msg)
+
+            except requests.exceptions.Timeout:
+                error_msg = f"Connection to Ollama timed out at {self.url}"
+                logger.error(error_msg)
+                raise ConnectionError(error_msg)
+
+            except Exception as e:
+                error_msg = f"Failed to connect to Ollama: {str(e)}"
+                logger.error(error_msg)
+                raise ConnectionError(error_msg)
 
     def generate(
         self,
         model: str,
         prompt: str,
         max_retries: int = 3,
-        retry_delay: int = 2
+        retry_delay: int = 2,
+        options: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generate response from Ollama model with retry logic
@@ -86,6 +226,7 @@ class OllamaClient:
             prompt: Prompt to send to model
             max_retries: Maximum number of retry attempts
             retry_delay: Delay between retries in seconds
+            options: Ollama model options (e.g. temperature)
 
         Returns:
             Generated response text
@@ -94,31 +235,28 @@ class OllamaClient:
             APIError: If generation fails after retries
             ConnectionError: If connection cannot be established
         """
-        # Verify connection if not already done
-        if not self._connection_verified:
-            self.verify_connection()
-
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False
-        }
+        body, headers = _encode_payload(_generate_payload(model, prompt, options))
 
         last_error = None
         start_time = time.time()
 
         for attempt in range(1, max_retries + 1):
+            # Only transient failures (timeouts, connection drops, 5xx) back off
+            backoff = False
+
             try:
                 logger.debug(f"API call attempt {attempt}/{max_retries} to model {model}")
 
-                response = requests.post(
+                # Stream tokens so the server never buffers the whole generation
+                with self.session.post(
                     self.url,
-                    json=payload,
-                    timeout=self.timeout
-                )
-
-                response.raise_for_status()
-                data = response.json()
+                    data=body,
+                    headers=headers,
+                    stream=True,
+                    timeout=self.request_timeout
+                ) as response:
+                    response.raise_for_status()
+                    data = _accumulate_streaming_response(response)
 
                 result = data.get("response", "").strip()
 
@@ -131,45 +269,204 @@ class OllamaClient:
 
                 return result
 
-            except requests.exceptions.Timeout:
-                last_error = f"Request timed out after {self.timeout} seconds"
+            except requests.exceptions.Timeout as e:
+                if isinstance(e, requests.exceptions.ConnectTimeout):
+                    last_error = f"Connection timed out after {self.connect_timeout} seconds"
+                else:
+                    last_error = f"Request timed out after {self.timeout} seconds"
                 logger.warning(f"Attempt {attempt} failed: {last_error}")
+                backoff = True
 
             except requests.exceptions.ConnectionError as e:
+                # Connectivity is not checked up front; on the first failure,
+                # surface the clearer verify_connection() diagnosis instead
+                if not self._connection_verified:
+                    self.verify_connection()
                 last_error = f"Connection failed: {str(e)}"
                 logger.warning(f"Attempt {attempt} failed: {last_error}")
+                backoff = True
 
             except requests.exceptions.HTTPError as e:
-                status_code = e.response.status_code if e.response else 'unknown'
-                last_error = f"HTTP {status_code}: {str(e)}"
+                # A Response is falsy for error statuses, so compare against None
+                status_code = e.response.status_code if e.response is not None else None
+                last_error = f"HTTP {status_code or 'unknown'}: {str(e)}"
                 logger.warning(f"Attempt {attempt} failed: {last_error}")
 
                 # Don't retry on 4xx errors (client errors)
-                if e.response and 400 <= e.response.status_code < 500:
+                if status_code is not None and 400 <= status_code < 500:
                     break
+                backoff = True
 
             except Exception as e:
                 last_error = f"Unexpected error: {str(e)}"
                 logger.warning(f"Attempt {attempt} failed: {last_error}")
 
-            # Wait before retry (except on last attempt)
-            if attempt < max_retries:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
+            # Wait before retrying a transient failure (except on last attempt),
+            # jittered so concurrent batch requests don't retry in lockstep
+            if backoff and attempt < max_retries:
+                delay = retry_delay * (0.5 + random.random())
+                logger.info(f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
                 retry_delay *= 2  # Exponential backoff
 
-        # All attempts failed
+        # All attempts failed (or a client error ended the loop early)
         duration = time.time() - start_time
         TPRMLogger.log_api_call(logger, f"Ollama/{model}", "failure", duration)
 
-        error_msg = f"Failed to generate response after {max_retries} attempts. Last error: {last_error}"
+        error_msg = f"Failed to generate response after {attempt} attempt(s). Last error: {last_error}"
         logger.error(error_msg)
         raise APIError(error_msg)
 
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Generate a response from Ollama, yielding text as tokens arrive
+
+        Unlike generate(), there is no retry: tokens may already have been
+        shown to the user by the time a failure occurs.
+
+        Args:
+            model: Model name to use
+            prompt: Prompt to send to model
+            options: Ollama model options (e.g. temperature)
+
+        Yields:
+            Response text fragments in order
+
+        Raises:
+            APIError: If generation fails or the model returns nothing
+            ConnectionError: If connection cannot be established
+        """
+        body, headers = _encode_payload(_generate_payload(model, prompt, options))
+        start_time = time.time()
+        got_text = False
+
+        try:
+            with self.session.post(
+                self.url,
+                data=body,
+                headers=headers,
+                stream=True,
+                timeout=self.request_timeout
+            ) as response:
+                response.raise_for_status()
+                for obj in _iter_stream_objects(response):
+                    token = obj.get("response", "")
+                    if token:
+                        got_text = got_text or not token.isspace()
+                        yield token
+
+        except requests.exceptions.ConnectionError as e:
+            if not self._connection_verified:
+                self.verify_connection()
+            TPRMLogger.log_api_call(logger, f"Ollama/{model}", "failure", time.time() - start_time)
+            raise ConnectionError(f"Connection failed: {str(e)}")
+
+        except requests.exceptions.RequestException as e:
+            TPRMLogger.log_api_call(logger, f"Ollama/{model}", "failure", time.time() - start_time)
+            raise APIError(f"Streaming generation failed: {str(e)}")
+
+        if not got_text:
+            logger.warning("Model returned empty response")
+            raise APIError("Model returned empty response")
+
+        TPRMLogger.log_api_call(logger, f"Ollama/{model}", "success", time.time() - start_time)
+
+    async def agenerate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Awaitable wrapper around generate() for use with asyncio.gather
+
+        The blocking request runs on the event loop's default executor and
+        shares this client's pooled session.
+
+        Args:
+            model: Model name to use
+            prompt: Prompt to send to model
+            options: Ollama model options (e.g. temperature)
+
+        Returns:
+            Generated response text
+
+        Raises:
+            APIError: If generation fails after retries
+            ConnectionError: If connection cannot be established
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.generate(model, prompt, options=options)
+        )
+
+    def embed(self, model: str, inputs: List[str]) -> List[List[float]]:
+        """
+        Embed several texts in a single /api/embed round-trip
+
+        Args:
+            model: Embedding model name
+            inputs: Texts to embed
+
+        Returns:
+            One embedding vector per input, in order
+
+        Raises:
+            APIError: If the request fails or the response is malformed
+            ConnectionError: If connection cannot be established
+        """
+        if not inputs:
+            return []
+
+        embed_url = self.url.replace('/api/generate', '/api/embed')
+        body, headers = _encode_payload({
+            "model": model,
+            "input": inputs,
+            "keep_alive": Config.OLLAMA_KEEP_ALIVE,
+        })
+        start_time = time.time()
+
+        try:
+            response = self.session.post(embed_url, data=body, headers=headers, timeout=self.request_timeout)
+            response.raise_for_status()
+            embeddings = response.json()["embeddings"]
+
+        except requests.exceptions.ConnectionError as e:
+            TPRMLogger.log_api_call(logger, f"Ollama/{model}/embed", "failure", time.time() - start_time)
+            raise ConnectionError(f"Connection failed: {str(e)}")
+
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            TPRMLogger.log_api_call(logger, f"Ollama/{model}/embed", "failure", time.time() - start_time)
+            raise APIError(f"Embedding request failed: {str(e)}")
+
+        if len(embeddings) != len(inputs):
+            raise APIError(f"Expected {len(inputs)} embeddings, got {len(embeddings)}")
+
+        TPRMLogger.log_api_call(logger, f"Ollama/{model}/embed", "success", time.time() - start_time)
+        return embeddings
+
+    def _remember_models(self, response: requests.Response) -> List[str]:
+        """Cache the model names from an /api/tags response and return them"""
+        try:
+            names = [m.get('name') for m in response.json().get('models', [])]
+        except ValueError:
+            return []
+        self._model_list = (time.monotonic(), names)
+        return names
+
     def check_model_available(self, model: str) -> bool:
         """
         Check if a model is available in Ollama
 
+        The model listing is fetched at most once per MODEL_LIST_TTL seconds
+        and shared across models, including the listing fetched by
+        verify_connection().
+
         Args:
             model: Model name to check
 
@@ -177,17 +474,19 @@ class OllamaClient:
             True if model is available
         """
         try:
-            tags_url = self.url.replace('/api/generate', '/api/tags')
-            response = requests.get(tags_url, timeout=5)
-            response.raise_for_status()
-
-            data = response.json()
-            models = data.get('models', [])
+            cached = self._model_list
+            if cached is not None and time.monotonic() - cached[0] < MODEL_LIST_TTL:
+                names = cached[1]
+            else:
+                tags_url = self.url.replace('/api/generate', '/api/tags')
+                response = self.session.get(tags_url, timeout=5)
+                response.raise_for_status()
+                names = self._remember_models(response)
 
-            available = any(m.get('name') == model for m in models)
+            available = model in names
 
             if not available:
-                logger.warning(f"Model '{model}' not found in Ollama. Available models: {[m.get('name') for m in models]}")
+                logger.warning(f"Model '{model}' not found in Ollama. Available models: {names}")
 
             return available
 
@@ -195,20 +494,101 @@ class OllamaClient:
             logger.error(f"Failed to check model availability: {e}")
             return False
 
-# Global client instance
+# Global client and cache instances
 _client = None
+_cache = None
 
 def get_client() -> OllamaClient:
     """Get or create global Ollama client instance"""
     global _client
     if _client is None:
         _client = OllamaClient()
+        atexit.register(_client.close)
     return _client
 
+def get_cache() -> LLMCache:
+    """Get or create global response cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
+
+def _cached_response(model_name: str, prompt: str) -> tuple:
+    """Look up a prompt in the response cache, returning (key, cached or None)"""
+    key = LLMCache.make_key(model_name, prompt)
+    cached = get_cache().get(key)
+    if cached is not None:
+        logger.debug(f"Cache hit for model {model_name} ({key[:12]})")
+    return key, cached
+
 def ask_model(model_name: str, prompt: str) -> str:
     """
     Convenience function for generating responses
 
+    When Config.OLLAMA_CACHE_ENABLED is set, identical prompts are served
+    from the on-disk cache and generation runs at temperature 0.
+
+    Args:
+        model_name: Model to use
+        prompt: Prompt to send
+
+    Returns:
+        Generated response
+
+    Raises:
+        APIError: If generation fails
+        ConnectionError: If connection fails
+    """
+    client = get_client()
+    if not Config.OLLAMA_CACHE_ENABLED:
+        return client.generate(model_name, prompt)
+
+    key, cached = _cached_response(model_name, prompt)
+    if cached is not None:
+        return cached
+
+    result = client.generate(model_name, prompt, options={"temperature": 0})
+    get_cache().set(key, result)
+    return result
+
+def ask_model_stream(model_name: str, prompt: str) -> Iterator[str]:
+    """
+    Streaming counterpart of ask_model(), for printing text as it arrives
+
+    A cached response is yielded whole; a fresh one is cached once the
+    stream completes.
+
+    Args:
+        model_name: Model to use
+        prompt: Prompt to send
+
+    Yields:
+        Response text fragments in order
+
+    Raises:
+        APIError: If generation fails
+        ConnectionError: If connection fails
+    """
+    client = get_client()
+    if not Config.OLLAMA_CACHE_ENABLED:
+        yield from client.generate_stream(model_name, prompt)
+        return
+
+    key, cached = _cached_response(model_name, prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    for token in client.generate_stream(model_name, prompt, options={"temperature": 0}):
+        chunks.append(token)
+        yield token
+    get_cache().set(key, "".join(chunks).strip())
+
+async def ask_model_async(model_name: str, prompt: str) -> str:
+    """
+    Awaitable counterpart of ask_model(), sharing the same response cache
+
     Args:
         model_name: Model to use
         prompt: Prompt to send
@@ -221,4 +601,50 @@ def ask_model(model_name: str, prompt: str) -> str:
         ConnectionError: If connection fails
     """
     client = get_client()
-    return client.generate(model_name, prompt)
+    if not Config.OLLAMA_CACHE_ENABLED:
+        return await client.agenerate(model_name, prompt)
+
+    key, cached = _cached_response(model_name, prompt)
+    if cached is not None:
+        return cached
+
+    result = await client.agenerate(model_name, prompt, options={"temperature": 0})
+    get_cache().set(key, result)
+    return result
+
+def ask_model_many(model_name: str, prompts: List[str]) -> List[str]:
+    """
+    Generate responses for several prompts concurrently
+
+    Prompts are dispatched with asyncio.gather over the pooled client
+    session, bounded by Config.OLLAMA_NUM_PARALLEL so the server is not
+    oversubscribed.
+
+    Args:
+        model_name: Model to use
+        prompts: Prompts to send
+
+    Returns:
+        Generated responses, in the same order as prompts
+
+    Raises:
+        APIError: If any generation fails
+        ConnectionError: If connection fails
+    """
+    if not prompts:
+        return []
+
+    # Identical prompts in one batch are only sent once
+    unique_prompts = list(dict.fromkeys(prompts))
+
+    async def _gather() -> List[str]:
+        slots = asyncio.Semaphore(max(1, Config.OLLAMA_NUM_PARALLEL))
+
+        async def _one(prompt: str) -> str:
+            async with slots:
+                return await ask_model_async(model_name, prompt)
+
+        return await asyncio.gather(*(_one(prompt) for prompt in unique_prompts))
+
+    responses = dict(zip(unique_prompts, asyncio.run(_gather())))
+    return [responses[prompt] for prompt in prompts]
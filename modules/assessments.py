@@ -1,8 +1,36 @@
 import json
+import re
 import datetime
+from string import Template
 from pathlib import Path
 from . import utils
 from modules.api_client import ask_model
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+OUT_DIR = Path("outputs")
+OUT_DIR.mkdir(exist_ok=True)
+
+# All domain scores on one line, e.g. "4 3 5 2 4" or "4,3,5,2,4"
+SCORES_LINE = re.compile(r"[1-5](?:[\s,]+[1-5])*")
+
+ANALYSIS_PROMPT = Template("""
+You are a third-party risk analyst. Based on the following control scores, provide:
+1. A brief risk summary (2–3 paragraphs)
+2. Key strengths
+3. Areas of concern
+4. 3 recommended improvements the vendor should implement
+
+Vendor: ${vendor_name}
+Organisation: ${org_id}
+Service: ${service}
+Scores: ${scores}
+Likelihood: ${likelihood}
+Impact: ${impact}
+Overall Score: ${overall}/5
+Risk Bucket: ${risk_bucket}
+""")
 
 def run(model_name):   # 👈 this is the entry point main.py is calling
     print("\n=== Vendor Assessment Wizard ===\n")
@@ -35,7 +63,21 @@ def run(model_name):   # 👈 this is the entry point main.py is calling
     print("\nScoring controls 1–5 (1=Unacceptable, 5=Strong Control)")
     domains = ["Governance", "Cybersecurity", "Data Protection", "Resilience", "Compliance"]
     scores = {}
+
+    raw = input(
+        f"All {len(domains)} scores on one line ({', '.join(domains)}), "
+        "or press Enter to score one at a time: "
+    ).strip()
+    if SCORES_LINE.fullmatch(raw):
+        values = [int(v) for v in re.findall(r"[1-5]", raw)]
+        if len(values) == len(domains):
+            scores = dict(zip(domains, values))
+    if raw and not scores:
+        print(f"Expected {len(domains)} scores between 1 and 5; scoring one at a time.")
+
     for d in domains:
+        if d in scores:
+            continue
         while True:
             try:
                 val = int(input(f"{d} score (1–5): "))
@@ -54,25 +96,20 @@ def run(model_name):   # 👈 this is the entry point main.py is calling
     vendor["risk_bucket"] = utils.classify_risk_bucket(vendor["likelihood"], vendor["impact"])
 
     # Ask AI for recommendations
-    prompt = f"""
-You are a third-party risk analyst. Based on the following control scores, provide:
-1. A brief risk summary (2–3 paragraphs)
-2. Key strengths
-3. Areas of concern
-4. 3 recommended improvements the vendor should implement
-
-Vendor: {vendor_name}
-Organisation: {org_id}
-Service: {vendor['service']}
-Scores: {json.dumps(scores, indent=2)}
-Likelihood: {vendor['likelihood']}
-Impact: {vendor['impact']}
-Overall Score: {vendor['overall_control_score']}/5
-Risk Bucket: {vendor['risk_bucket']}
-"""
+    prompt = ANALYSIS_PROMPT.substitute(
+        vendor_name=vendor_name,
+        org_id=org_id,
+        service=vendor['service'],
+        scores=json.dumps(scores, indent=2),
+        likelihood=vendor['likelihood'],
+        impact=vendor['impact'],
+        overall=vendor['overall_control_score'],
+        risk_bucket=vendor['risk_bucket'],
+    )
 
     print("\n🤖 Generating analysis and recommendations...")
-    ai_text = ask_model(model_name, prompt)
+    with utils.timed_model_call(logger, f"assessment/{model_name}"):
+        ai_text = ask_model(model_name, prompt)
     vendor["ai_analysis"] = ai_text
 
     # Save to DB
@@ -80,9 +117,7 @@ Risk Bucket: {vendor['risk_bucket']}
     utils.save_vendor_db(db)
     utils.snapshot_history(org_id, vendor_name, vendor)
 
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
-    file_path = out_dir / f"{org_id.replace(' ', '_')}_{vendor_name.replace(' ', '_')}_assessment.txt"
+    file_path = OUT_DIR / f"{org_id.replace(' ', '_')}_{vendor_name.replace(' ', '_')}_assessment.txt"
     file_path.write_text(ai_text, encoding="utf-8")
 
     print(f"\n✅ Vendor assessment complete. Saved to {file_path}\n")
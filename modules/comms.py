@@ -1,6 +1,48 @@
+from string import Template
 from pathlib import Path
 from . import utils
-from modules.api_client import ask_model
+from modules.api_client import ask_model_many, ask_model_stream
+from modules.logger import get_logger
+from modules.validators import ValidationError
+
+logger = get_logger(__name__)
+
+OUT_DIR = Path("outputs")
+OUT_DIR.mkdir(exist_ok=True)
+
+MESSAGE_PROMPT = Template("""
+You are drafting a professional communication.
+
+You must respect strict client isolation:
+Only talk about this organisation (${org_id}) and this vendor (${vendor_name}).
+Never mention other clients, other vendors, or portfolio context unless explicitly internal.
+
+Message type: ${msg_type}
+Organisation / Client: ${org_id}
+Vendor: ${vendor_name}
+Business owner: ${business_owner}
+Vendor service / data handled: ${service}
+Current assessed likelihood: ${likelihood}
+Current assessed impact: ${impact}
+Overall control score: ${overall_control_score}/5
+Risk bucket: ${risk_bucket}
+
+Outstanding tracked actions:
+${actions_snippet}
+
+Additional context from analyst:
+${context_additional}
+
+Tone requirements:
+- Audience type: ${audience}
+- Redaction level: ${redaction}
+If audience is 'vendor', be firm but professional, request evidence or remediation, and set expectation for timeline.
+If audience is 'internal_update', summarise risk and next steps in plain business language.
+If audience is 'executive_escalation', be concise, impact-focused, and include urgency.
+If audience is 'vendor', do NOT include internal scoring methodology ("you are critical high risk because..."). Just state what's required.
+If audience is 'internal' or 'executive', you MAY reference risk in impact/likelihood terms.
+Write as an email body. Do not include greeting placeholders like 'Hi NAME' unless natural.
+""")
 
 def run(model_name):
     print("\n=== Vendor / Stakeholder Communication Draft ===\n")
@@ -10,21 +52,28 @@ def run(model_name):
         print("No vendors found in data/vendors.json yet.")
         return
 
-    org_id = input("Which organisation / client? (exact name): ").strip()
-    if org_id not in db:
-        print(f"No records for org '{org_id}'.")
+    try:
+        org_id = utils.resolve_org(db, input("Which organisation / client? (exact name): "))
+    except ValidationError as e:
+        print(e)
         return
 
-    vendor_name = input("Which vendor? (exact name): ").strip()
-    if vendor_name not in db[org_id]:
-        print(f"Vendor '{vendor_name}' not found under org '{org_id}'.")
+    # Several vendors can be drafted in one go; their prompts are generated concurrently
+    vendor_inputs = [
+        v for v in input("Which vendor(s)? (exact name, comma-separated for several): ").split(",")
+        if v.strip()
+    ]
+    if not vendor_inputs:
+        print("No vendor given.")
         return
 
-    vendor_record = db[org_id][vendor_name]
-
-    # safety check for isolation
-    if vendor_record["org_id"] != org_id:
-        print("Data isolation check failed. Aborting.")
+    try:
+        # Case-insensitive lookup; also enforces the isolation check
+        vendor_names = list(dict.fromkeys(
+            utils.resolve(db, org_id, v)[1] for v in vendor_inputs
+        ))
+    except ValidationError as e:
+        print(e)
         return
 
     print("\nWhat type of message do you want to draft?")
@@ -50,62 +99,57 @@ def run(model_name):
 
     audience, redaction = utils.ask_audience_and_redaction()
 
-    # We'll surface open actions to help with the ask.
-    actions_snippet = ""
-    if vendor_record.get("open_actions"):
-        actions_snippet = "\nOpen Actions / Outstanding Items:\n"
-        for a in vendor_record["open_actions"]:
-            actions_snippet += f"- [{a.get('urgency','').upper()}] {a.get('owner_type','')}: {a.get('action','')}\n"
-
-    prompt = f"""
-You are drafting a professional communication.
-
-You must respect strict client isolation:
-Only talk about this organisation ({org_id}) and this vendor ({vendor_name}).
-Never mention other clients, other vendors, or portfolio context unless explicitly internal.
-
-Message type: {msg_type}
-Organisation / Client: {org_id}
-Vendor: {vendor_name}
-Business owner: {vendor_record['business_owner']}
-Vendor service / data handled: {vendor_record['service']}
-Current assessed likelihood: {vendor_record['likelihood']}
-Current assessed impact: {vendor_record['impact']}
-Overall control score: {vendor_record['overall_control_score']}/5
-Risk bucket: {vendor_record.get('risk_bucket', utils.classify_risk_bucket(vendor_record['likelihood'], vendor_record['impact']))}
-
-Outstanding tracked actions:
-{actions_snippet}
-
-Additional context from analyst:
-{context_additional}
-
-Tone requirements:
-- Audience type: {audience}
-- Redaction level: {redaction}
-If audience is 'vendor', be firm but professional, request evidence or remediation, and set expectation for timeline.
-If audience is 'internal_update', summarise risk and next steps in plain business language.
-If audience is 'executive_escalation', be concise, impact-focused, and include urgency.
-If audience is 'vendor', do NOT include internal scoring methodology ("you are critical high risk because..."). Just state what's required.
-If audience is 'internal' or 'executive', you MAY reference risk in impact/likelihood terms.
-Write as an email body. Do not include greeting placeholders like 'Hi NAME' unless natural.
-"""
-
-    print("\n🤖 Generating communication draft with model:", model_name, "...\n")
-    message_text = ask_model(model_name, prompt)
-
-    print("\n----- Suggested Message -----\n")
-    print(message_text)
-    print("\n-----------------------------\n")
-
-    save_choice = input("Save this message to outputs as .txt? (y/n): ").strip().lower()
-    if save_choice == "y":
-        safe_org = org_id.replace(" ", "_")
-        safe_vendor = vendor_name.replace(" ", "_")
-        out_dir = Path("outputs")
-        out_dir.mkdir(exist_ok=True)
-        outfile = out_dir / f"{safe_org}_{safe_vendor}_message.txt"
-        outfile.write_text(message_text, encoding="utf-8")
-        print(f"✅ Saved draft to {outfile.resolve()}")
+    prompts = []
+    for vendor_name in vendor_names:
+        vendor_record = db[org_id][vendor_name]
+
+        # We'll surface open actions to help with the ask.
+        actions_snippet = ""
+        if vendor_record.get("open_actions"):
+            actions_snippet = "\nOpen Actions / Outstanding Items:\n"
+            for a in vendor_record["open_actions"]:
+                actions_snippet += f"- [{a.get('urgency','').upper()}] {a.get('owner_type','')}: {a.get('action','')}\n"
+
+        prompt = MESSAGE_PROMPT.substitute(
+            org_id=org_id,
+            vendor_name=vendor_name,
+            msg_type=msg_type,
+            business_owner=vendor_record['business_owner'],
+            service=vendor_record['service'],
+            likelihood=vendor_record['likelihood'],
+            impact=vendor_record['impact'],
+            overall_control_score=vendor_record['overall_control_score'],
+            risk_bucket=vendor_record['risk_bucket'],
+            actions_snippet=actions_snippet,
+            context_additional=context_additional,
+            audience=audience,
+            redaction=redaction,
+        )
+        prompts.append(prompt)
+
+    print("\n🤖 Generating communication draft(s) with model:", model_name, "...\n")
+    if len(prompts) == 1:
+        # Single draft: show it as it is generated
+        print(f"\n----- Suggested Message: {vendor_names[0]} -----\n")
+        with utils.timed_model_call(logger, f"communication/{model_name}"):
+            messages = [utils.echo_stream(ask_model_stream(model_name, prompts[0]))]
+        print("\n-----------------------------\n")
+    else:
+        with utils.timed_model_call(logger, f"communication/{model_name}"):
+            messages = ask_model_many(model_name, prompts)
+
+    for vendor_name, message_text in zip(vendor_names, messages):
+        if len(messages) > 1:
+            print(f"\n----- Suggested Message: {vendor_name} -----\n")
+            print(message_text)
+            print("\n-----------------------------\n")
+
+        save_choice = input("Save this message to outputs as .txt? (y/n): ").strip().lower()
+        if save_choice == "y":
+            safe_org = org_id.replace(" ", "_")
+            safe_vendor = vendor_name.replace(" ", "_")
+            outfile = OUT_DIR / f"{safe_org}_{safe_vendor}_message.txt"
+            outfile.write_text(message_text, encoding="utf-8")
+            print(f"✅ Saved draft to {outfile.resolve()}")
 
     print("\nDone.\n")
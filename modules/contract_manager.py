@@ -3,14 +3,84 @@ Contract Lifecycle Management Module
 Manages vendor contracts, renewals, SLAs, and spend tracking
 """
 import datetime
+import re
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from modules.logger import get_logger, TPRMLogger
 from modules.validators import InputValidator, ValidationError
 from modules import utils
 
 logger = get_logger(__name__)
 
+# Zero-padded YYYY-MM-DD, the form fromisoformat can take without surprises
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _validate_iso(value: str) -> Optional[datetime.date]:
+    """
+    Validate a user-entered YYYY-MM-DD date without raising
+
+    Accepts exactly what _parse_ymd accepts, including non-padded legacy
+    dates such as 2025-1-5.
+
+    Args:
+        value: Date string to check
+
+    Returns:
+        The date, or None if the string is not a real YYYY-MM-DD date
+    """
+    try:
+        return _parse_ymd(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_ymd(value: str) -> datetime.date:
+    """
+    Parse a YYYY-MM-DD contract date
+
+    Contract dates repeat heavily across a portfolio, so parsed values are
+    memoized. Zero-padded dates take the fromisoformat fast path; anything
+    else falls back to strptime, which still accepts non-padded legacy
+    dates (2025-1-5) but not the basic format (20251231) or ISO week dates
+    that fromisoformat allows on Python 3.11+.
+
+    Args:
+        value: Date string in YYYY-MM-DD format
+
+    Returns:
+        Parsed date
+
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date
+    """
+    if _ISO_DATE.match(value):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@lru_cache(maxsize=4096)
+def _ymd_ordinal(value: str) -> int:
+    """
+    Day number (proleptic ordinal) of a YYYY-MM-DD contract date
+
+    Args:
+        value: Date string in YYYY-MM-DD format
+
+    Returns:
+        Ordinal day, so day differences are plain integer subtraction
+
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date
+    """
+    return _parse_ymd(value).toordinal()
+
 
 def add_contract_to_vendor(vendor_record: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -32,24 +102,22 @@ def add_contract_to_vendor(vendor_record: Dict[str, Any]) -> Dict[str, Any]:
     print("\n📅 CONTRACT DATES:")
     start_date = input("Contract start date (YYYY-MM-DD) [Enter to skip]: ").strip()
     if start_date:
-        try:
-            datetime.datetime.strptime(start_date, "%Y-%m-%d")
+        if _validate_iso(start_date):
             contract["start_date"] = start_date
-        except ValueError:
+        else:
             print("⚠️  Invalid date format, skipping")
 
     end_date = input("Contract end date (YYYY-MM-DD) [Enter to skip]: ").strip()
+    end_dt = _validate_iso(end_date) if end_date else None
     if end_date:
-        try:
-            datetime.datetime.strptime(end_date, "%Y-%m-%d")
+        if end_dt:
             contract["end_date"] = end_date
-        except ValueError:
+        else:
             print("⚠️  Invalid date format, skipping")
 
     # Calculate renewal date (typically 60-90 days before end)
-    if end_date:
+    if end_dt:
         try:
-            end_dt = datetime.datetime.strptime(end_date, "%Y-%m-%d")
             notice_days = input("Notice period in days (default 90): ").strip()
             notice_days = int(notice_days) if notice_days else 90
             contract["notice_period_days"] = notice_days
@@ -58,7 +126,7 @@ def add_contract_to_vendor(vendor_record: Dict[str, Any]) -> Dict[str, Any]:
             contract["renewal_date"] = renewal_dt.strftime("%Y-%m-%d")
 
             # Calculate days until renewal
-            today = datetime.datetime.now()
+            today = datetime.date.today()
             days_until_renewal = (renewal_dt - today).days
             contract["days_until_renewal"] = days_until_renewal
 
@@ -70,7 +138,7 @@ def add_contract_to_vendor(vendor_record: Dict[str, Any]) -> Dict[str, Any]:
                 print(f"🟡 Renewal due in {days_until_renewal} days")
 
         except Exception as e:
-            logger.warning(f"Error calculating renewal date: {e}")
+            logger.warning("Error calculating renewal date: %s", e)
 
     # Auto-renewal
     auto_renewal = input("Auto-renewal? (y/n) [default: n]: ").strip().lower()
@@ -127,64 +195,107 @@ def add_contract_to_vendor(vendor_record: Dict[str, Any]) -> Dict[str, Any]:
         contract["termination_for_convenience"] = termination_clause == "y"
 
     # Add metadata
-    contract["created_at"] = datetime.datetime.now().isoformat()
-    contract["last_updated"] = datetime.datetime.now().isoformat()
+    contract["created_at"] = contract["last_updated"] = datetime.datetime.now().isoformat()
 
     # Update vendor record
     vendor_record["contract"] = contract
 
-    logger.info(f"Added contract details to vendor: {vendor_record.get('vendor_name')}")
+    logger.info("Added contract details to vendor: %s", vendor_record.get("vendor_name"))
 
     return vendor_record
 
 
-def get_expiring_contracts(db: Dict[str, Any], days_threshold: int = 90) -> List[Dict[str, Any]]:
+def iter_contracts(db: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
     """
-    Get list of contracts expiring within the threshold
+    Walk every vendor that has contract details
 
     Args:
         db: Vendor database
-        days_threshold: Number of days to look ahead
 
-    Returns:
-        List of vendor records with expiring contracts
+    Yields:
+        (org_id, vendor_name, contract) for each vendor with a non-empty contract
     """
-    expiring = []
-    today = datetime.datetime.now()
-
     for org_id, vendors in db.items():
         for vendor_name, vendor_record in vendors.items():
-            contract = vendor_record.get("contract", {})
+            contract = vendor_record.get("contract")
+            if contract:
+                yield org_id, vendor_name, contract
+
+
+def build_end_date_index(db: Dict[str, Any]) -> List[Tuple[int, str, str]]:
+    """
+    Build a sorted index of contract end dates
 
-            if not contract or "end_date" not in contract:
-                continue
+    Args:
+        db: Vendor database
+
+    Returns:
+        (end_date_ordinal, org_id, vendor_name) tuples in end-date order;
+        contracts with an unreadable end date are skipped
+    """
+    index = []
+    ordinal = _ymd_ordinal
+
+    for org_id, vendor_name, contract in iter_contracts(db):
+        if "end_date" not in contract:
+            continue
+
+        try:
+            index.append((ordinal(contract["end_date"]), org_id, vendor_name))
+        except (TypeError, ValueError) as e:
+            logger.warning("Error processing contract for %s: %s", vendor_name, e)
+
+    index.sort()
+    return index
+
+
+def get_expiring_contracts(db: Dict[str, Any], days_threshold: int = 90,
+                           index: Optional[List[Tuple[int, str, str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Get list of contracts expiring within the threshold
 
-            try:
-                end_date = datetime.datetime.strptime(contract["end_date"], "%Y-%m-%d")
-                days_until_expiry = (end_date - today).days
+    Args:
+        db: Vendor database
+        days_threshold: Number of days to look ahead
+        index: Index from build_end_date_index(db), for callers querying the
+            same db more than once; built from db when omitted
 
-                if 0 <= days_until_expiry <= days_threshold:
-                    expiring.append({
-                        "org_id": org_id,
-                        "vendor_name": vendor_name,
-                        "end_date": contract["end_date"],
-                        "days_until_expiry": days_until_expiry,
-                        "contract_value": contract.get("contract_value_annual", "N/A"),
-                        "auto_renewal": contract.get("auto_renewal", False)
-                    })
-            except Exception as e:
-                logger.warning(f"Error processing contract for {vendor_name}: {e}")
+    Returns:
+        List of vendor records with expiring contracts, soonest first
+    """
+    if index is None:
+        index = build_end_date_index(db)
 
-    return sorted(expiring, key=lambda x: x["days_until_expiry"])
+    today = datetime.date.today().toordinal()
 
+    # The window is a contiguous slice of the sorted index
+    lo = bisect_left(index, (today,))
+    hi = bisect_left(index, (today + days_threshold + 1,))
 
-def check_sla_compliance(vendor_record: Dict[str, Any], incident_data: Optional[Dict] = None) -> Dict[str, Any]:
+    expiring = []
+    for end_ordinal, org_id, vendor_name in index[lo:hi]:
+        contract = db[org_id][vendor_name]["contract"]
+        expiring.append({
+            "org_id": org_id,
+            "vendor_name": vendor_name,
+            "end_date": contract["end_date"],
+            "days_until_expiry": end_ordinal - today,
+            "contract_value": contract.get("contract_value_annual", "N/A"),
+            "auto_renewal": contract.get("auto_renewal", False)
+        })
+
+    return expiring
+
+
+def check_sla_compliance(vendor_record: Dict[str, Any], incident_data: Optional[Dict] = None,
+                         checked_at: Optional[str] = None) -> Dict[str, Any]:
     """
     Check if vendor is meeting SLA commitments
 
     Args:
         vendor_record: Vendor record with contract SLAs
         incident_data: Optional incident data to check against SLAs
+        checked_at: ISO timestamp to record as last_checked (defaults to now)
 
     Returns:
         SLA compliance report
@@ -200,11 +311,32 @@ def check_sla_compliance(vendor_record: Dict[str, Any], incident_data: Optional[
         "sla_uptime": contract.get("sla_uptime"),
         "sla_response_time": contract.get("sla_response_time"),
         "sla_resolution_time": contract.get("sla_resolution_time"),
-        "last_checked": datetime.datetime.now().isoformat(),
+        "last_checked": checked_at or datetime.datetime.now().isoformat(),
         "message": "Manual SLA tracking - integrate with monitoring system"
     }
 
 
+def check_sla_compliance_all(db: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Check SLA compliance for every vendor in the database
+
+    Args:
+        db: Vendor database
+
+    Returns:
+        SLA compliance reports keyed by org_id, then vendor name, all
+        stamped with the same check time
+    """
+    checked_at = datetime.datetime.now().isoformat()
+    return {
+        org_id: {
+            vendor_name: check_sla_compliance(vendor_record, checked_at=checked_at)
+            for vendor_name, vendor_record in vendors.items()
+        }
+        for org_id, vendors in db.items()
+    }
+
+
 def run():
     """
     Main contract management workflow
@@ -262,14 +394,14 @@ def run():
             utils.snapshot_history(org_id, vendor_name, updated_record)
 
             print("\n✅ Contract details saved successfully")
-            logger.info(f"Contract updated for {org_id}/{vendor_name}")
+            logger.info("Contract updated for %s/%s", org_id, vendor_name)
 
         elif choice == "2":
             # View expiring contracts
             days = input("\n👉 Show contracts expiring in next X days (default 90): ").strip()
             days_threshold = int(days) if days else 90
 
-            expiring = get_expiring_contracts(db, days_threshold)
+            expiring = get_expiring_contracts(db, days_threshold, index=build_end_date_index(db))
 
             if not expiring:
                 print(f"\n✅ No contracts expiring in the next {days_threshold} days")
@@ -294,25 +426,18 @@ def run():
             print("\n📊 ALL VENDOR CONTRACTS:")
             print("="*70)
 
-            for org_id, vendors in db.items():
-                org_contracts = 0
-
-                for vendor_name, vendor_record in vendors.items():
-                    contract = vendor_record.get("contract")
-
-                    if contract:
-                        org_contracts += 1
-                        total_contracts += 1
+            for org_id, vendor_name, contract in iter_contracts(db):
+                total_contracts += 1
 
-                        value = contract.get("contract_value_annual", 0)
-                        if value:
-                            total_value += value
+                value = contract.get("contract_value_annual", 0)
+                if value:
+                    total_value += value
 
-                        print(f"\n🏢 {vendor_name} ({org_id})")
-                        print(f"   Start: {contract.get('start_date', 'N/A')}")
-                        print(f"   End: {contract.get('end_date', 'N/A')}")
-                        print(f"   Value: {contract.get('contract_value_annual', 'N/A')} {contract.get('currency', '')}")
-                        print(f"   Owner: {contract.get('contract_owner', 'N/A')}")
+                print(f"\n🏢 {vendor_name} ({org_id})")
+                print(f"   Start: {contract.get('start_date', 'N/A')}")
+                print(f"   End: {contract.get('end_date', 'N/A')}")
+                print(f"   Value: {contract.get('contract_value_annual', 'N/A')} {contract.get('currency', '')}")
+                print(f"   Owner: {contract.get('contract_owner', 'N/A')}")
 
             print("\n" + "="*70)
             print(f"📊 SUMMARY:")
@@ -343,9 +468,9 @@ def run():
             # Export contract register
             from openpyxl import Workbook
 
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Contract Register"
+            # Write-only mode streams rows instead of keeping every cell in memory
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Contract Register")
 
             # Headers
             ws.append([
@@ -366,27 +491,24 @@ def run():
             ])
 
             # Data
-            for org_id, vendors in db.items():
-                for vendor_name, vendor_record in vendors.items():
-                    contract = vendor_record.get("contract", {})
-
-                    if contract:
-                        ws.append([
-                            org_id,
-                            vendor_name,
-                            contract.get("start_date", ""),
-                            contract.get("end_date", ""),
-                            contract.get("renewal_date", ""),
-                            contract.get("days_until_renewal", ""),
-                            "Yes" if contract.get("auto_renewal") else "No",
-                            contract.get("contract_value_annual", ""),
-                            contract.get("currency", ""),
-                            contract.get("notice_period_days", ""),
-                            contract.get("sla_uptime", ""),
-                            contract.get("sla_response_time", ""),
-                            contract.get("contract_owner", ""),
-                            contract.get("payment_terms", "")
-                        ])
+            for org_id, vendor_name, contract in iter_contracts(db):
+                g = contract.get
+                ws.append([
+                    org_id,
+                    vendor_name,
+                    g("start_date", ""),
+                    g("end_date", ""),
+                    g("renewal_date", ""),
+                    g("days_until_renewal", ""),
+                    "Yes" if g("auto_renewal") else "No",
+                    g("contract_value_annual", ""),
+                    g("currency", ""),
+                    g("notice_period_days", ""),
+                    g("sla_uptime", ""),
+                    g("sla_response_time", ""),
+                    g("contract_owner", ""),
+                    g("payment_terms", "")
+                ])
 
             # Save
             out_dir = Path("outputs")
@@ -398,12 +520,12 @@ def run():
 
             wb.save(filepath)
             print(f"\n✅ Contract register exported to: {filepath.resolve()}")
-            logger.info(f"Contract register exported: {filepath}")
+            logger.info("Contract register exported: %s", filepath)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Operation cancelled")
     except Exception as e:
-        logger.error(f"Error in contract management: {e}", exc_info=True)
+        logger.error("Error in contract management: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}")
         print("Check logs for details")
 
@@ -2,17 +2,23 @@
 Dashboard Launcher Module
 Launches the Streamlit dashboard in a separate process
 """
+import os
 import subprocess
 import sys
 from pathlib import Path
-from modules.logger import get_logger
+from modules.logger import get_logger, TPRMLogger
 
 logger = get_logger(__name__)
 
 
-def run():
+def run(replace_process: bool = False):
     """
-    Launch the Streamlit dashboard in a separate process
+    Launch the Streamlit dashboard
+
+    Args:
+        replace_process: Exec Streamlit in place of this process instead of
+            running it as a child. Used when launched standalone, where there
+            is no menu to return to.
     """
     print("\n" + "="*60)
     print("  📊 LAUNCHING TPRM DASHBOARD")
@@ -22,7 +28,7 @@ def run():
 
     if not dashboard_path.exists():
         print(f"\n❌ Dashboard file not found: {dashboard_path}")
-        logger.error(f"Dashboard file not found: {dashboard_path}")
+        logger.error("Dashboard file not found: %s", dashboard_path)
         return
 
     print("\n🚀 Starting Streamlit dashboard...")
@@ -31,22 +37,32 @@ def run():
 
     logger.info("Launching Streamlit dashboard")
 
+    command = [sys.executable, "-m", "streamlit", "run", str(dashboard_path)]
+
     try:
-        # Launch Streamlit
-        subprocess.run(
-            [sys.executable, "-m", "streamlit", "run", str(dashboard_path)],
-            check=True
-        )
+        if replace_process:
+            # Exit handlers do not run across exec, so flush logs first
+            TPRMLogger.shutdown()
+            sys.stdout.flush()
+            try:
+                os.execv(sys.executable, command)
+            except OSError:
+                # Still running in this process: bring file logging back
+                TPRMLogger.resume()
+                raise
+
+        # Launch Streamlit as a child so the menu resumes when it stops
+        subprocess.run(command, check=True)
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Error launching dashboard: {e}")
-        logger.error(f"Failed to launch dashboard: {e}")
+        logger.error("Failed to launch dashboard: %s", e)
     except KeyboardInterrupt:
         print("\n\n👋 Dashboard stopped by user")
         logger.info("Dashboard stopped by user")
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
-        logger.error(f"Unexpected error launching dashboard: {e}", exc_info=True)
+        logger.error("Unexpected error launching dashboard: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
-    run()
+    run(replace_process=True)
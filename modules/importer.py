@@ -7,7 +7,8 @@ def run():
     print("\n=== Bulk Vendor Import (Excel) ===\n")
     excel_path = input("Path to Excel file (e.g. inputs/vendors_seed.xlsx): ").strip()
 
-    wb = load_workbook(excel_path)
+    # Read-only mode streams rows instead of loading every cell and style
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
     ws = wb.active  # assume first sheet is the data
 
     # expected columns in row 1:
@@ -15,7 +16,7 @@ def run():
     # business_owner | likelihood | impact |
     # ac_iam | encrypt | logging | bcp | privacy
 
-    headers = [cell.value for cell in ws[1]]
+    headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
     col_index = {h: i for i, h in enumerate(headers)}
 
     required_cols = [
@@ -28,29 +29,39 @@ def run():
     for rc in required_cols:
         if rc not in col_index:
             print(f"❌ Missing column in Excel: {rc}")
+            wb.close()
             return
 
+    # Column positions, resolved once instead of per cell
+    (i_org, i_vendor, i_service, i_regulator, i_owner, i_likelihood, i_impact,
+     i_ac_iam, i_encrypt, i_logging, i_bcp, i_privacy) = (col_index[c] for c in required_cols)
+
     db = utils.load_vendor_db()
+    pending_snapshots = []
 
     for row in ws.iter_rows(min_row=2, values_only=True):
-        org_id = str(row[col_index["org_id"]]).strip()
-        vendor_name = str(row[col_index["vendor_name"]]).strip()
-        service_desc = str(row[col_index["service_description"]]).strip()
-        regulator = str(row[col_index["regulatory_scope"]]).strip()
-        owner = str(row[col_index["business_owner"]]).strip()
-        likelihood = str(row[col_index["likelihood"]]).strip().lower()
-        impact = str(row[col_index["impact"]]).strip().lower()
+        org_id = str(row[i_org]).strip()
+        vendor_name = str(row[i_vendor]).strip()
+        service_desc = str(row[i_service]).strip()
+        regulator = str(row[i_regulator]).strip()
+        owner = str(row[i_owner]).strip()
+        likelihood = str(row[i_likelihood]).strip().lower()
+        impact = str(row[i_impact]).strip().lower()
 
+        ac_iam, encrypt, logging_score, bcp, privacy = (
+            int(row[i_ac_iam]), int(row[i_encrypt]), int(row[i_logging]),
+            int(row[i_bcp]), int(row[i_privacy]),
+        )
         control_scores = {
-            "Access Control / Identity Management": int(row[col_index["ac_iam"]]),
-            "Encryption & Key Management": int(row[col_index["encrypt"]]),
-            "Monitoring & Logging": int(row[col_index["logging"]]),
-            "Business Continuity / DR / Resilience": int(row[col_index["bcp"]]),
-            "Privacy & Regulatory Compliance": int(row[col_index["privacy"]]),
+            "Access Control / Identity Management": ac_iam,
+            "Encryption & Key Management": encrypt,
+            "Monitoring & Logging": logging_score,
+            "Business Continuity / DR / Resilience": bcp,
+            "Privacy & Regulatory Compliance": privacy,
         }
 
         overall_control = round(
-            sum(control_scores.values()) / len(control_scores), 2
+            (ac_iam + encrypt + logging_score + bcp + privacy) / 5, 2
         )
 
         risk_bucket = utils.classify_risk_bucket(likelihood, impact)
@@ -68,8 +79,7 @@ def run():
             "overall_control_score": overall_control,
             "assessed_at": datetime.datetime.now().isoformat(),
             "assessed_by": "import",
-            "open_actions": [],
-            "risk_acceptances": []
+            "open_actions": []
         }
 
         missing = utils.validate_vendor_record(record)
@@ -80,7 +90,11 @@ def run():
         # commit to DB
         db = utils.ensure_org(db, org_id)
         db[org_id][vendor_name] = record
-        utils.snapshot_history(org_id, vendor_name, record)
+        pending_snapshots.append((org_id, vendor_name, record))
+
+    wb.close()
+
+    utils.snapshot_history_bulk(pending_snapshots)
 
     utils.save_vendor_db(db)
     print("✅ Import complete. Vendors added/updated in data/vendors.json.\n")
@@ -0,0 +1,107 @@
+"""
+On-disk cache for LLM responses
+Exact-match cache keyed by a hash of model name and prompt
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from config import Config
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Recently used responses kept in memory in front of the on-disk cache
+MEMORY_CACHE_SIZE = 128
+
+class LLMCache:
+    """
+    Stores one JSON file per cached response under Config.LLM_CACHE_DIR,
+    with a small in-memory LRU in front so repeat hits skip the file read
+    """
+
+    def __init__(self, cache_dir: Path = None, memory_size: int = MEMORY_CACHE_SIZE):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory holding cached responses (defaults to config)
+            memory_size: Number of responses held in memory
+        """
+        self.cache_dir = Path(cache_dir or Config.LLM_CACHE_DIR)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """
+        Build the cache key for a model/prompt pair
+
+        Args:
+            model: Model name
+            prompt: Full prompt text
+
+        Returns:
+            Hex digest identifying the request
+        """
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))["response"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: str):
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key()
+            value: Response text to cache
+        """
+        self._remember(key, value)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._path(key).write_text(
+                json.dumps({"response": value}, ensure_ascii=False),
+                encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry: {e}")
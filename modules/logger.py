@@ -2,8 +2,10 @@
 Production-grade logging module for TPRM system
 Provides structured logging with rotation, multiple handlers, and security
 """
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from config import Config
@@ -12,6 +14,72 @@ class TPRMLogger:
     """Centralized logging configuration for TPRM system"""
 
     _loggers = {}
+    _level = None
+    _logs_dir_ready = False
+    _queue_handler = None
+    _listener = None
+    _listener_running = False
+
+    @classmethod
+    def _get_queue_handler(cls) -> logging.Handler:
+        """
+        Shared handler that hands file records to a background writer thread
+
+        A single rotating file handler is owned by a QueueListener, so callers
+        only enqueue records and never block on disk writes.
+
+        Returns:
+            QueueHandler feeding the log file listener
+        """
+        if cls._queue_handler is None:
+            if not cls._logs_dir_ready:
+                Config.LOGS_DIR.mkdir(exist_ok=True)
+                cls._logs_dir_ready = True
+
+            file_handler = logging.handlers.RotatingFileHandler(
+                Config.LOG_FILE,
+                maxBytes=10 * 1024 * 1024,  # 10MB
+                backupCount=5,
+                encoding='utf-8'
+            )
+            file_handler.setLevel(logging.DEBUG)
+            file_formatter = logging.Formatter(Config.LOG_FORMAT)
+            file_handler.setFormatter(file_formatter)
+
+            log_queue = queue.SimpleQueue()
+            cls._listener = logging.handlers.QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            cls._listener.start()
+            cls._listener_running = True
+            atexit.register(cls.shutdown)
+            cls._queue_handler = logging.handlers.QueueHandler(log_queue)
+
+        return cls._queue_handler
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Flush queued records to the log file and stop the writer thread
+
+        Runs at interpreter exit; call it directly before replacing the
+        process (os.exec*), where exit handlers do not run.
+        """
+        if cls._listener is not None and cls._listener_running:
+            cls._listener.stop()
+            cls._listener_running = False
+
+    @classmethod
+    def resume(cls):
+        """
+        Restart the writer thread after shutdown()
+
+        For when a process replacement fails and this process keeps running;
+        records queued in the meantime are written once it restarts.
+        """
+        if cls._listener is not None and not cls._listener_running:
+            cls._listener.start()
+            cls._listener_running = True
 
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
@@ -24,15 +92,19 @@ class TPRMLogger:
         Returns:
             Configured logger instance
         """
-        if name in cls._loggers:
-            return cls._loggers[name]
-
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+        logger = cls._loggers.get(name)
+        if logger is not None:
+            return logger
 
         # Prevent duplicate handlers
+        logger = logging.getLogger(name)
         if logger.handlers:
-            return logger
+            return cls._loggers.setdefault(name, logger)
+
+        # Resolve the level once rather than per logger
+        if cls._level is None:
+            cls._level = getattr(logging, Config.LOG_LEVEL)
+        logger.setLevel(cls._level)
 
         # Console handler with color coding
         console_handler = logging.StreamHandler(sys.stdout)
@@ -42,23 +114,14 @@ class TPRMLogger:
         )
         console_handler.setFormatter(console_formatter)
 
-        # File handler with rotation
-        Config.LOGS_DIR.mkdir(exist_ok=True)
-        file_handler = logging.handlers.RotatingFileHandler(
-            Config.LOG_FILE,
-            maxBytes=10 * 1024 * 1024,  # 10MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(Config.LOG_FORMAT)
-        file_handler.setFormatter(file_formatter)
-
         logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        # File output goes through the shared queue to the rotating log file
+        logger.addHandler(cls._get_queue_handler())
+
+        # Records are fully handled here; don't emit them again via root handlers
+        logger.propagate = False
 
-        cls._loggers[name] = logger
-        return logger
+        return cls._loggers.setdefault(name, logger)
 
     @classmethod
     def log_api_call(cls, logger: logging.Logger, endpoint: str, status: str, duration: float = None):
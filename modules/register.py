@@ -13,20 +13,13 @@ def run():
     ts = utils.today_short()
     safe_org = org_id.replace(" ", "_")
 
-    # build scoped vendor list
-    scoped = []
-    if org_id == "ALL":
-        for o, vendors in db.items():
-            for vname, vrec in vendors.items():
-                scoped.append(vrec)
-    else:
-        for vname, vrec in db.get(org_id, {}).items():
-            scoped.append(vrec)
+    # vendors in scope, consumed by the single export pass below
+    orgs = db.values() if org_id == "ALL" else [db.get(org_id, {})]
+    scoped = (vrec for vendors in orgs for vrec in vendors.values())
 
-    # build workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Risk Register"
+    # build workbook; write-only mode streams rows instead of keeping every cell in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Risk Register")
 
     ws.append([
         "Org",
@@ -40,8 +33,13 @@ def run():
         "Notes / Follow-up"
     ])
 
+    # add open actions sheet; both sheets and the text register fill in one pass
+    ws2 = wb.create_sheet("Open Actions")
+    ws2.append(["Org","Vendor","OwnerType","Urgency","Action","Status"])
+
+    register_lines = []
     for v in scoped:
-        bucket = v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"]))
+        bucket = v.get("risk_bucket") or utils.classify_risk_bucket(v["likelihood"], v["impact"])
         ws.append([
             v["org_id"],
             v["vendor_name"],
@@ -54,10 +52,6 @@ def run():
             "See 'Open Actions' tab"
         ])
 
-    # add open actions sheet
-    ws2 = wb.create_sheet("Open Actions")
-    ws2.append(["Org","Vendor","OwnerType","Urgency","Action","Status"])
-    for v in scoped:
         for a in v.get("open_actions", []):
             ws2.append([
                 v["org_id"],
@@ -68,17 +62,16 @@ def run():
                 a.get("status","open")
             ])
 
+        register_lines.append(
+            f"{v['org_id']} | {v['vendor_name']} | Owner={v['business_owner']} | "
+            f"Score={v['overall_control_score']} | Likelihood={v['likelihood']} | "
+            f"Impact={v['impact']} | Risk={bucket}\n"
+        )
+
     out_path = Path(f"outputs/risk_register_{safe_org}_{ts}.xlsx")
     wb.save(out_path)
     print(f"✅ Risk register Excel created: {out_path.resolve()}")
 
     txt_path = Path(f"outputs/risk_register_{safe_org}_{ts}.txt")
-    with open(txt_path, "w", encoding="utf-8") as f:
-        for v in scoped:
-            bucket = v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"]))
-            f.write(
-                f"{v['org_id']} | {v['vendor_name']} | Owner={v['business_owner']} | "
-                f"Score={v['overall_control_score']} | Likelihood={v['likelihood']} | "
-                f"Impact={v['impact']} | Risk={bucket}\n"
-            )
+    txt_path.write_text("".join(register_lines), encoding="utf-8")
     print(f"✅ Risk register text created: {txt_path.resolve()}\n")
@@ -1,19 +1,58 @@
 import json
 from pathlib import Path
+from string import Template
 from . import utils
-from modules.api_client import ask_model
+from modules.api_client import ask_model, ask_model_many
+from modules.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_PROMPT = Template("""
+You are a senior risk & compliance manager.
+
+Generate a concise management / board / client report summarizing the third-party risk posture.
+
+Organisation scope: ${org_id}
+Do NOT mention any other organisation unless org_id is 'ALL'.
+Assume strict confidentiality between clients.
+
+Data points:
+- Total vendors: ${total}
+- Average control score: ${avg_control}
+- High-risk vendors: ${high}
+- Medium-risk vendors: ${medium}
+- Low-risk vendors: ${low}
+- Weakest control domain overall: ${weakest_domain}
+
+Write these sections:
+1. Executive Overview / Current Posture
+2. High-Risk Third Parties (and why they matter)
+3. Thematic Weaknesses (logging, DR/BCP, evidence freshness, etc.)
+4. Required Actions / Owners / Urgency
+   - Vendor-facing asks
+   - Internal owner obligations
+   - Governance/contractual improvements
+5. Recommendations for Next Quarter
+
+Tone requirements:
+- Audience type: ${audience}
+- Redaction level: ${redaction}
+If audience is 'client', never mention other clients.
+If audience is 'vendor', keep focus on what that vendor needs to do, do not expose broader environment.
+If audience is 'exec', keep it business-impact focused.
+""")
 
 def build_org_view(db, org_id):
     """
     Returns: dict { vendor_name: vendor_record } scoped to org_id (or ALL).
     """
     if org_id == "ALL":
-        merged = {}
         # merge across orgs with vendor_name keyed as "<org>::<vendor>" to avoid clash
-        for org, vendors in db.items():
-            for vname, vrec in vendors.items():
-                merged[f"{org}::{vname}"] = vrec
-        return merged
+        return {
+            f"{org}::{vname}": vrec
+            for org, vendors in db.items()
+            for vname, vrec in vendors.items()
+        }
     else:
         return db.get(org_id, {})
 
@@ -27,22 +66,31 @@ def calculate_summary(scoped_vendors):
             "weakest_domain": "n/a"
         }
 
-    avg_control = sum(v["overall_control_score"] for v in scoped_vendors.values()) / total
-
+    total_score = 0
     counts = {"high":0, "medium":0, "low":0}
-    domain_scores = {}
+    domain_agg = {}  # domain -> [score sum, vendor count]
 
+    # one pass accumulates the average, bucket counts and domain totals
     for v in scoped_vendors.values():
+        total_score += v["overall_control_score"]
+
         bucket = utils.classify_risk_bucket(v["likelihood"], v["impact"])
         counts[bucket] = counts.get(bucket, 0) + 1
 
         for d,s in v["control_scores"].items():
-            domain_scores.setdefault(d, []).append(s)
+            agg = domain_agg.get(d)
+            if agg is None:
+                domain_agg[d] = [s, 1]
+            else:
+                agg[0] += s
+                agg[1] += 1
+
+    avg_control = total_score / total
 
     # weakest avg domain
     weakest_domain = "n/a"
-    if domain_scores:
-        avg_domains = {d: sum(scores)/len(scores) for d, scores in domain_scores.items()}
+    if domain_agg:
+        avg_domains = {d: s/n for d, (s, n) in domain_agg.items()}
         weakest_domain = min(avg_domains, key=avg_domains.get)
 
     return {
@@ -52,6 +100,19 @@ def calculate_summary(scoped_vendors):
         "weakest_domain": weakest_domain
     }
 
+def build_report_prompt(org_id, summary, audience, redaction):
+    return REPORT_PROMPT.substitute(
+        org_id=org_id,
+        total=summary['total'],
+        avg_control=summary['avg_control'],
+        high=summary['risk_counts']['high'],
+        medium=summary['risk_counts']['medium'],
+        low=summary['risk_counts']['low'],
+        weakest_domain=summary['weakest_domain'],
+        audience=audience,
+        redaction=redaction,
+    )
+
 def run(model_name):
     print("\n=== Portfolio / Management Report Generator ===\n")
     db = utils.load_vendor_db()
@@ -63,55 +124,37 @@ def run(model_name):
 
     audience, redaction = utils.ask_audience_and_redaction()
 
-    # build narrative prompt
-    prompt = f"""
-You are a senior risk & compliance manager.
-
-Generate a concise management / board / client report summarizing the third-party risk posture.
+    # (org, vendors, summary) for every report to produce; the rollup comes first
+    reports = [(org_id, scoped_vendors, summary)]
+    if org_id == "ALL" and len(db) > 1:
+        per_org = input("Also generate a separate report for each organisation? (y/n): ").strip().lower()
+        if per_org == "y":
+            reports += [(org, vendors, calculate_summary(vendors)) for org, vendors in db.items()]
 
-Organisation scope: {org_id}
-Do NOT mention any other organisation unless org_id is 'ALL'.
-Assume strict confidentiality between clients.
-
-Data points:
-- Total vendors: {summary['total']}
-- Average control score: {summary['avg_control']}
-- High-risk vendors: {summary['risk_counts']['high']}
-- Medium-risk vendors: {summary['risk_counts']['medium']}
-- Low-risk vendors: {summary['risk_counts']['low']}
-- Weakest control domain overall: {summary['weakest_domain']}
-
-Write these sections:
-1. Executive Overview / Current Posture
-2. High-Risk Third Parties (and why they matter)
-3. Thematic Weaknesses (logging, DR/BCP, evidence freshness, etc.)
-4. Required Actions / Owners / Urgency
-   - Vendor-facing asks
-   - Internal owner obligations
-   - Governance/contractual improvements
-5. Recommendations for Next Quarter
+    # ask export format up front so nothing waits on the user once generation starts
+    fmt = utils.ask_output_format()
 
-Tone requirements:
-- Audience type: {audience}
-- Redaction level: {redaction}
-If audience is 'client', never mention other clients.
-If audience is 'vendor', keep focus on what that vendor needs to do, do not expose broader environment.
-If audience is 'exec', keep it business-impact focused.
-"""
+    # build narrative prompts
+    prompts = [build_report_prompt(org, s, audience, redaction) for org, _, s in reports]
 
     print("🤖 Generating executive summary with model:", model_name)
-    narrative_text = ask_model(model_name, prompt)
-
-    # ask export format
-    fmt = utils.ask_output_format()
+    with utils.timed_model_call(logger, f"portfolio_report/{model_name}"):
+        if len(prompts) == 1:
+            narratives = [ask_model(model_name, prompts[0])]
+        else:
+            # One prompt per report, generated concurrently
+            narratives = ask_model_many(model_name, prompts)
 
     # export all the different formats (PPT, PDF, PowerBI, etc.)
-    utils.export_portfolio_artifacts(
-        org_id=org_id,
-        db_for_report=scoped_vendors,
-        summary_dict=summary,
-        narrative_text=narrative_text,
-        fmt=fmt
-    )
+    ts = utils.today_short()
+    for (org, vendors, s), narrative_text in zip(reports, narratives):
+        utils.export_portfolio_artifacts(
+            org_id=org,
+            db_for_report=vendors,
+            summary_dict=s,
+            narrative_text=narrative_text,
+            fmt=fmt,
+            ts=ts
+        )
 
     print("\n✅ Portfolio report complete.\n")
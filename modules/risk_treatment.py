@@ -1,24 +1,33 @@
 import datetime
+import re
 from pathlib import Path
 from . import utils
 
+# Statuses that count towards treatment completion
+TREATMENT_STATUSES = frozenset({"Mitigate", "Transfer", "Accept"})
+
+# Treatment status and description per risk level; anything else is accepted
+TREATMENT_BY_LEVEL = {
+    "high": ("Mitigate", (
+        "Enhance controls or remediation before engagement/renewal. "
+        "Escalate to Risk / Legal for contractual clauses."
+    )),
+    "medium": ("Transfer", (
+        "Include contractual/insurance clauses, document obligations, "
+        "and track remediation timelines."
+    )),
+    "low": ("Accept", (
+        "Risk is within tolerance. Maintain monitoring and schedule periodic review."
+    )),
+}
+
+# Evidence-note wording that flags a key issue
+ISSUE_KEYWORDS = re.compile(r"gap|missing|no ", re.IGNORECASE)
+
 
 def classify_treatment_action(risk_level: str):
     lvl = (risk_level or "").strip().lower()
-    if lvl == "high":
-        return "Mitigate", (
-            "Enhance controls or remediation before engagement/renewal. "
-            "Escalate to Risk / Legal for contractual clauses."
-        )
-    elif lvl == "medium":
-        return "Transfer", (
-            "Include contractual/insurance clauses, document obligations, "
-            "and track remediation timelines."
-        )
-    else:
-        return "Accept", (
-            "Risk is within tolerance. Maintain monitoring and schedule periodic review."
-        )
+    return TREATMENT_BY_LEVEL.get(lvl, TREATMENT_BY_LEVEL["low"])
 
 
 def build_vendor_rows(db_for_org):
@@ -48,10 +57,17 @@ def generate_summary(vendor_rows):
     total = len(vendor_rows)
     if total == 0:
         return None
-    high_count = sum(1 for v in vendor_rows if v["risk_level"] == "High")
-    med_count = sum(1 for v in vendor_rows if v["risk_level"] == "Medium")
-    low_count = sum(1 for v in vendor_rows if v["risk_level"] == "Low")
-    treated = sum(1 for v in vendor_rows if v["treatment_status"] in ["Mitigate","Transfer","Accept"])
+    high_count = med_count = low_count = treated = 0
+    for v in vendor_rows:
+        risk_level = v["risk_level"]
+        if risk_level == "High":
+            high_count += 1
+        elif risk_level == "Medium":
+            med_count += 1
+        elif risk_level == "Low":
+            low_count += 1
+        if v["treatment_status"] in TREATMENT_STATUSES:
+            treated += 1
     completion_pct = round((treated / total) * 100, 1) if total else 0.0
     next_review_date = (datetime.date.today() + datetime.timedelta(days=90)).strftime("%d %B %Y")
     return {
@@ -92,8 +108,7 @@ def _extract_key_issues(rec):
     for dom_name, note in ev.items():
         if not note:
             continue
-        low = note.lower()
-        if "gap" in low or "missing" in low or "no " in low:
+        if ISSUE_KEYWORDS.search(note):
             issues.append(f"{dom_name}: {note}")
     if not issues:
         return "None identified"
@@ -112,8 +127,10 @@ def _summarize_vendor_record(vendor_name, rec):
     }
 
 
-def run_for_single_vendor(org, vendor, model_name):
-    db = utils.load_vendor_db()
+def run_for_single_vendor(org, vendor, model_name, db=None):
+    # callers that already hold the vendor DB pass it in to skip a reload
+    if db is None:
+        db = utils.load_vendor_db()
     if org not in db or vendor not in db[org]:
         print(f"[!] Vendor {vendor} not found under {org}")
         return
@@ -153,8 +170,9 @@ def run_for_single_vendor(org, vendor, model_name):
     print(f"\n📝 Vendor treatment summary saved: {out_path.resolve()}\n")
 
 
-def run_for_org(org, model_name):
-    db = utils.load_vendor_db()
+def run_for_org(org, model_name, db=None):
+    if db is None:
+        db = utils.load_vendor_db()
     if org not in db or not db[org]:
         print(f"[!] No vendors found for {org}")
         return
@@ -163,6 +181,12 @@ def run_for_org(org, model_name):
     for v_name, rec in db[org].items():
         summaries.append(_summarize_vendor_record(v_name, rec))
 
+    # one formatted register row per vendor, shared by the console and the file
+    register_lines = [
+        f"{s['vendor']} | {s['risk_level']} | {s['key_issues']} | {s['last_assessed']}"
+        for s in summaries
+    ]
+
     total = len(summaries)
     high = sum(1 for s in summaries if str(s["risk_level"]).lower().startswith("high"))
     med  = sum(1 for s in summaries if str(s["risk_level"]).lower().startswith("med"))
@@ -188,8 +212,7 @@ def run_for_org(org, model_name):
 
     print("\nVendor Risk Register")
     print("(Vendor | Risk Rating | Key Issues | Last Assessed)")
-    for s in summaries:
-        print(f"- {s['vendor']} | {s['risk_level']} | {s['key_issues']} | {s['last_assessed']}")
+    print("\n".join(f"- {line}" for line in register_lines))
     print("---------------------------------------\n")
 
     out_dir = Path("outputs")
@@ -208,10 +231,7 @@ def run_for_org(org, model_name):
     lines.append(f"Next Review Date: {next_review}")
     lines.append("")
     lines.append("Vendor Risk Register (Vendor | Risk | Key Issues | Last Assessed)")
-    for s in summaries:
-        lines.append(
-            f"{s['vendor']} | {s['risk_level']} | {s['key_issues']} | {s['last_assessed']}"
-        )
+    lines.extend(register_lines)
     out_path.write_text("\n".join(lines), encoding="utf-8")
     print(f"📊 Org management summary saved: {out_path.resolve()}\n")
 
@@ -239,9 +259,9 @@ def _print_org_summary(org, vendor_rows):
 
     print("\nVendor Risk Register:")
     print("(Vendor | Risk Rating | Likelihood/Impact | Treatment Status | Last Assessed)")
-    for idx, row in enumerate(vendor_rows, start=1):
-        print(
-            f"{idx}. {row['vendor_name']} | {row['risk_level']} | "
-            f"{row['likelihood']}/{row['impact']} | {row['treatment_status']} | {row['assessment_date']}"
-        )
+    print("\n".join(
+        f"{idx}. {row['vendor_name']} | {row['risk_level']} | "
+        f"{row['likelihood']}/{row['impact']} | {row['treatment_status']} | {row['assessment_date']}"
+        for idx, row in enumerate(vendor_rows, start=1)
+    ))
     print("---------------------------------------\n")
@@ -1,6 +1,7 @@
 """
 Vendor search and filtering with production features
 """
+import sys
 from typing import List, Dict, Any
 from . import utils
 from modules.logger import get_logger, TPRMLogger
@@ -16,16 +17,17 @@ def print_vendor_block(v: Dict[str, Any]) -> None:
         v: Vendor record dictionary
     """
     try:
-        risk_bucket = v.get('risk_bucket', utils.classify_risk_bucket(v['likelihood'], v['impact']))
-
-        print("\n" + "="*70)
-        print(f"📊 Organization: {v.get('org_id', 'N/A')}")
-        print(f"🏢 Vendor: {v.get('vendor_name', 'N/A')}")
-        print(f"📋 Service: {v.get('service', 'N/A')}")
-        print(f"👤 Business Owner: {v.get('business_owner', 'N/A')}")
-        print(f"⚖️  Overall Control Score: {v.get('overall_control_score', 'N/A')}/5")
-        print(f"📉 Likelihood: {v.get('likelihood', 'N/A').upper()}")
-        print(f"📈 Impact: {v.get('impact', 'N/A').upper()}")
+        risk_bucket = v['risk_bucket']
+
+        # Assemble the block and write it in one go rather than line by line
+        out = ["\n" + "="*70]
+        out.append(f"📊 Organization: {v.get('org_id', 'N/A')}")
+        out.append(f"🏢 Vendor: {v.get('vendor_name', 'N/A')}")
+        out.append(f"📋 Service: {v.get('service', 'N/A')}")
+        out.append(f"👤 Business Owner: {v.get('business_owner', 'N/A')}")
+        out.append(f"⚖️  Overall Control Score: {v.get('overall_control_score', 'N/A')}/5")
+        out.append(f"📉 Likelihood: {v.get('likelihood', 'N/A').upper()}")
+        out.append(f"📈 Impact: {v.get('impact', 'N/A').upper()}")
 
         # Color-code risk bucket
         risk_display = risk_bucket.upper()
@@ -36,28 +38,29 @@ def print_vendor_block(v: Dict[str, Any]) -> None:
         else:
             risk_display = f"🟢 {risk_display} RISK"
 
-        print(f"⚠️  Risk Bucket: {risk_display}")
+        out.append(f"⚠️  Risk Bucket: {risk_display}")
 
         # Control scores with visual indicators
         control_scores = v.get("control_scores", {})
         if control_scores:
-            print(f"\n📋 Control Domain Scores:")
+            out.append(f"\n📋 Control Domain Scores:")
             for domain, score in control_scores.items():
                 indicator = "✅" if score >= 4 else ("⚠️" if score >= 3 else "❌")
-                print(f"   {indicator} {domain}: {score}/5")
+                out.append(f"   {indicator} {domain}: {score}/5")
 
         # Open actions
         open_actions = v.get("open_actions", [])
         if open_actions:
-            print(f"\n📌 Open Actions ({len(open_actions)}):")
+            out.append(f"\n📌 Open Actions ({len(open_actions)}):")
             for idx, action in enumerate(open_actions, 1):
                 urgency = action.get('urgency', '?').upper()
                 urgency_icon = "🔴" if urgency == "HIGH" else ("🟡" if urgency == "MEDIUM" else "🟢")
                 owner = action.get('owner_type', 'Unknown')
                 action_text = action.get('action', 'No description')
-                print(f"   {idx}. {urgency_icon} [{urgency}] {owner}: {action_text}")
+                out.append(f"   {idx}. {urgency_icon} [{urgency}] {owner}: {action_text}")
 
-        print("="*70 + "\n")
+        out.append("="*70 + "\n")
+        sys.stdout.write("\n".join(out) + "\n")
 
     except Exception as e:
         logger.error(f"Error displaying vendor block: {e}")
@@ -150,9 +153,9 @@ def run(_model_name=None):
                 print("❌ Please enter a vendor name")
                 return
 
-            name_lower = name.lower()
+            needle = name.casefold()
             for v in scoped:
-                if name_lower in v.get("vendor_name", "").lower():
+                if needle in v.get("vendor_name", "").casefold():
                     results.append(v)
                     print_vendor_block(v)
 
@@ -170,7 +173,7 @@ def run(_model_name=None):
                 return
 
             for v in scoped:
-                bucket = v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"]))
+                bucket = v["risk_bucket"]
                 if bucket == level:
                     results.append(v)
                     print_vendor_block(v)
@@ -186,11 +189,18 @@ def run(_model_name=None):
                 print("❌ Please enter a control domain keyword")
                 return
 
-            domain_lower = domain.lower()
+            needle = domain.casefold()
+            # Domain names repeat across vendors, so match each distinct name once
+            domain_hits = {}
             for v in scoped:
                 control_scores = v.get("control_scores", {})
                 for d, score in control_scores.items():
-                    if domain_lower in d.lower() and score <= 2:
+                    if score > 2:
+                        continue
+                    hit = domain_hits.get(d)
+                    if hit is None:
+                        hit = domain_hits[d] = needle in d.casefold()
+                    if hit:
                         results.append(v)
                         print_vendor_block(v)
                         break
@@ -207,13 +217,12 @@ def run(_model_name=None):
                 print_vendor_block(v)
 
         elif choice == "5":
-            for v in scoped:
-                open_actions = v.get("open_actions", [])
-                for a in open_actions:
-                    if a.get("urgency", "").lower() == "high":
-                        results.append(v)
-                        print_vendor_block(v)
-                        break
+            results = [
+                v for v in scoped
+                if any((a.get("urgency") or "").lower() == "high" for a in v.get("open_actions", ()))
+            ]
+            for v in results:
+                print_vendor_block(v)
 
             if not results:
                 print("\n✅ No vendors with HIGH urgency open actions found")
@@ -244,61 +253,80 @@ def _display_analytics(vendors: List[Dict[str, Any]]) -> None:
     Args:
         vendors: List of vendor records
     """
-    print("\n" + "="*70)
-    print("  VENDOR RISK ANALYTICS")
-    print("="*70)
+    # Report text is collected and written once
+    out = ["\n" + "="*70, "  VENDOR RISK ANALYTICS", "="*70]
 
     total = len(vendors)
     if total == 0:
-        print("\n⚠️  No vendors to analyze")
+        out.append("\n⚠️  No vendors to analyze")
+        sys.stdout.write("\n".join(out) + "\n")
         return
 
+    # Single pass over the vendors collects every figure shown below
+    bucket_counts = {"high": 0, "medium": 0, "low": 0}
+    score_total = 0
+    score_count = 0
+    total_actions = 0
+    vendors_with_actions = 0
+    high_urgency_actions = 0
+    domain_scores = {}  # domain -> [score sum, vendor count]
+
+    for v in vendors:
+        bucket = v["risk_bucket"]
+        if bucket in bucket_counts:
+            bucket_counts[bucket] += 1
+
+        score = v.get("overall_control_score")
+        if score:
+            score_total += score
+            score_count += 1
+
+        open_actions = v.get("open_actions", [])
+        if open_actions:
+            total_actions += len(open_actions)
+            vendors_with_actions += 1
+            high_urgency_actions += sum((a.get("urgency") or "").lower() == "high" for a in open_actions)
+
+        for domain, domain_score in v.get("control_scores", {}).items():
+            agg = domain_scores.get(domain)
+            if agg is None:
+                domain_scores[domain] = [domain_score, 1]
+            else:
+                agg[0] += domain_score
+                agg[1] += 1
+
     # Risk distribution
-    high_risk = sum(1 for v in vendors if v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"])) == "high")
-    med_risk = sum(1 for v in vendors if v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"])) == "medium")
-    low_risk = sum(1 for v in vendors if v.get("risk_bucket", utils.classify_risk_bucket(v["likelihood"], v["impact"])) == "low")
+    high_risk = bucket_counts["high"]
+    med_risk = bucket_counts["medium"]
+    low_risk = bucket_counts["low"]
 
-    print(f"\n📊 RISK DISTRIBUTION:")
-    print(f"   🔴 High Risk: {high_risk} ({high_risk/total*100:.1f}%)")
-    print(f"   🟡 Medium Risk: {med_risk} ({med_risk/total*100:.1f}%)")
-    print(f"   🟢 Low Risk: {low_risk} ({low_risk/total*100:.1f}%)")
+    out.append(f"\n📊 RISK DISTRIBUTION:")
+    out.append(f"   🔴 High Risk: {high_risk} ({high_risk/total*100:.1f}%)")
+    out.append(f"   🟡 Medium Risk: {med_risk} ({med_risk/total*100:.1f}%)")
+    out.append(f"   🟢 Low Risk: {low_risk} ({low_risk/total*100:.1f}%)")
 
     # Average control score
-    scores = [v.get("overall_control_score", 0) for v in vendors if v.get("overall_control_score")]
-    if scores:
-        avg_score = sum(scores) / len(scores)
-        print(f"\n⚖️  AVERAGE CONTROL SCORE: {avg_score:.2f}/5")
+    if score_count:
+        avg_score = score_total / score_count
+        out.append(f"\n⚖️  AVERAGE CONTROL SCORE: {avg_score:.2f}/5")
 
     # Open actions analysis
-    total_actions = sum(len(v.get("open_actions", [])) for v in vendors)
-    vendors_with_actions = sum(1 for v in vendors if v.get("open_actions"))
-    high_urgency_actions = sum(
-        sum(1 for a in v.get("open_actions", []) if a.get("urgency", "").lower() == "high")
-        for v in vendors
-    )
-
-    print(f"\n📌 OPEN ACTIONS:")
-    print(f"   Total Actions: {total_actions}")
-    print(f"   Vendors with Actions: {vendors_with_actions} ({vendors_with_actions/total*100:.1f}%)")
-    print(f"   🔴 High Urgency Actions: {high_urgency_actions}")
+    out.append(f"\n📌 OPEN ACTIONS:")
+    out.append(f"   Total Actions: {total_actions}")
+    out.append(f"   Vendors with Actions: {vendors_with_actions} ({vendors_with_actions/total*100:.1f}%)")
+    out.append(f"   🔴 High Urgency Actions: {high_urgency_actions}")
 
     # Domain analysis
-    domain_scores = {}
-    for v in vendors:
-        for domain, score in v.get("control_scores", {}).items():
-            if domain not in domain_scores:
-                domain_scores[domain] = []
-            domain_scores[domain].append(score)
-
     if domain_scores:
-        print(f"\n📋 WEAKEST CONTROL DOMAINS:")
-        domain_avgs = {d: sum(scores)/len(scores) for d, scores in domain_scores.items()}
+        out.append(f"\n📋 WEAKEST CONTROL DOMAINS:")
+        domain_avgs = {d: s/n for d, (s, n) in domain_scores.items()}
         sorted_domains = sorted(domain_avgs.items(), key=lambda x: x[1])
         for domain, avg in sorted_domains[:3]:
             indicator = "❌" if avg < 3 else "⚠️"
-            print(f"   {indicator} {domain}: {avg:.2f}/5")
+            out.append(f"   {indicator} {domain}: {avg:.2f}/5")
 
-    print("\n" + "="*70)
+    out.append("\n" + "="*70)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def _export_search_results(vendors: List[Dict[str, Any]], org_id: str) -> None:
@@ -311,7 +339,6 @@ def _export_search_results(vendors: List[Dict[str, Any]], org_id: str) -> None:
     """
     try:
         from pathlib import Path
-        import json
 
         safe_org = InputValidator.sanitize_filename(org_id.replace(" ", "_"))
         timestamp = utils.now_iso()
@@ -330,7 +357,7 @@ def _export_search_results(vendors: List[Dict[str, Any]], org_id: str) -> None:
             "vendors": vendors
         }
 
-        filepath.write_text(json.dumps(export_data, indent=2), encoding="utf-8")
+        utils.write_json_file(filepath, export_data)
         print(f"\n✅ Search results exported to: {filepath.resolve()}")
         logger.info(f"Search results exported: {filepath}")
 
@@ -1,12 +1,64 @@
 
 
 import datetime
+import json
+import sys
+from bisect import bisect_right
 from pathlib import Path
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side
-from . import utils
+from openpyxl.utils import get_column_letter
+from config import Config
+from . import risk_treatment, utils
 from modules.api_client import ask_model
 
+try:
+    import xlsxwriter  # Optional: faster, constant-memory Excel export
+except ImportError:
+    xlsxwriter = None
+
+OUT_DIR = Path("outputs")
+OUT_DIR.mkdir(exist_ok=True)
+
+# Characters that cannot appear in output file names
+_SAFE_TABLE = str.maketrans({c: "_" for c in ' /\\:*?'})
+
+# Excel export styles, shared by every cell that uses them
+_BOLD = Font(bold=True)
+_HEADER_BOLD = Font(bold=True, size=14)
+_MID_BOLD = Font(bold=True, size=12)
+_CENTER = Alignment(horizontal="center", vertical="center", wrap_text=True)
+_WRAP = Alignment(wrap_text=True, vertical="top")
+_THIN = Side(style="thin")
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# Lower bounds of the Medium and Low bands, ascending, and the label per band
+_RISK_BANDS = (3.0, 4.0)
+_RISK_LABELS = ("High", "Medium", "Low")
+
+_SHEET_TITLE = "Vendor Risk Assessment"
+_COLUMN_WIDTHS = (32, 16, 14, 22, 44)
+
+# Per-style cell attributes for each Excel backend
+_OPENPYXL_STYLES = {
+    "title": {"font": _HEADER_BOLD},
+    "section": {"font": _MID_BOLD},
+    "label": {"font": _BOLD},
+    "header": {"font": _BOLD, "alignment": _CENTER, "border": _BORDER},
+    "cell": {"alignment": _WRAP, "border": _BORDER},
+}
+_XLSXWRITER_FORMATS = {
+    "title": {"bold": True, "font_size": 14},
+    "section": {"bold": True, "font_size": 12},
+    "label": {"bold": True},
+    "header": {"bold": True, "align": "center", "valign": "vcenter", "text_wrap": True, "border": 1},
+    "cell": {"text_wrap": True, "valign": "top", "border": 1},
+}
+
+def _slug(name):
+    return name.translate(_SAFE_TABLE)
+
 # === WEIGHT MODEL (TOTAL = 100%)
 TPRM_DOMAINS = [
     {
@@ -69,7 +121,7 @@ TPRM_DOMAINS = [
     },
 ]
 
-def ask_score(question_text):
+def ask_score(question_text, default=None):
     print(f"\n{question_text}")
     print("  Rate 1–5:")
     print("   5 = Strong control (evidence verified)")
@@ -77,8 +129,11 @@ def ask_score(question_text):
     print("   3 = Moderate control (some gaps)")
     print("   2 = Weak control (no formal process)")
     print("   1 = Unacceptable (missing control)")
+    prompt = "  Score: " if default is None else f"  Score (Enter to keep {default}): "
     while True:
-        raw = input("  Score: ").strip()
+        raw = input(prompt).strip()
+        if not raw and default is not None:
+            return default
         try:
             val = int(raw)
             if 1 <= val <= 5:
@@ -87,14 +142,27 @@ def ask_score(question_text):
             pass
         print("  Enter 1, 2, 3, 4, or 5.")
 
-def score_domain(domain):
+def _preset_score(answers, question_text):
+    """Scripted answer for a question, or None if absent or not an integer 1-5"""
+    s = answers.get(question_text)
+    if isinstance(s, int) and not isinstance(s, bool) and 1 <= s <= 5:
+        return s
+    return None
+
+def score_domain(domain, prior=None, answers=None):
+    prior = prior or {}
+    answers = answers or {}
     weighted_sum = 0.0
     total_w = 0.0
     q_details = []
 
     print(f"\n--- {domain['name']} (Weight {domain['weight']}%) ---")
     for q in domain["questions"]:
-        s = ask_score(q["q"])
+        s = _preset_score(answers, q["q"])
+        if s is None:
+            s = ask_score(q["q"], default=prior.get(q["q"]))
+        else:
+            print(f"\n{q['q']}\n  Score: {s} (from answers file)")
         q_details.append({
             "question": q["q"],
             "score": s,
@@ -118,41 +186,18 @@ def compute_total_weighted_score(domain_results):
     return total_weighted_score, composite_pct_score
 
 def classify_risk_level(total_weighted_score):
-    if total_weighted_score >= 4.0:
-        return "Low"
-    elif total_weighted_score >= 3.0:
-        return "Medium"
-    else:
-        return "High"
-
-def export_to_excel(org, vendor, assessment_date, likelihood, impact,
-                    total_weighted_score, risk_level, domain_results,
-                    approvals, evidence_notes):
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Vendor Risk Assessment"
-
-    bold = Font(bold=True)
-    header_bold = Font(bold=True, size=14)
-    mid_bold = Font(bold=True, size=12)
-    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    wrap = Alignment(wrap_text=True, vertical="top")
-    border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
+    # A score equal to a threshold falls into the band above it
+    return _RISK_LABELS[bisect_right(_RISK_BANDS, total_weighted_score)]
 
-    row = 1
-    ws["A1"] = f"Vendor Risk Assessment – {vendor} ({org})"
-    ws["A1"].font = header_bold
-    row += 2
+def _assessment_rows(org, vendor, assessment_date, likelihood, impact,
+                     total_weighted_score, risk_level, domain_results,
+                     approvals, evidence_notes):
+    """Sheet rows as lists of (value, style key) pairs; style None = plain"""
+    header = lambda labels: [(h, "header") for h in labels]
 
-    ws["A"+str(row)] = "Assessment Summary"
-    ws["A"+str(row)].font = mid_bold
-    row += 1
+    yield [(f"Vendor Risk Assessment – {vendor} ({org})", "title")]
+    yield []
+    yield [("Assessment Summary", "section")]
 
     summary_fields = [
         ("Organisation", org),
@@ -164,80 +209,78 @@ def export_to_excel(org, vendor, assessment_date, likelihood, impact,
         ("Overall Risk Level", risk_level),
     ]
     for label, value in summary_fields:
-        ws["A"+str(row)] = label
-        ws["A"+str(row)].font = bold
-        ws["B"+str(row)] = value
-        row += 1
-
-    row += 1
-
-    ws["A"+str(row)] = "Control Domain Breakdown"
-    ws["A"+str(row)].font = mid_bold
-    row += 1
-
-    ws["A"+str(row)] = "Control Domain"
-    ws["B"+str(row)] = "Weight %"
-    ws["C"+str(row)] = "Score (1–5)"
-    ws["D"+str(row)] = "Weighted Contribution"
-    ws["E"+str(row)] = "Evidence / Notes"
-    for col in "ABCDE":
-        cell = ws[col+str(row)]
-        cell.font = bold
-        cell.alignment = center
-        cell.border = border
-    row += 1
+        yield [(label, "label"), (value, None)]
 
+    yield []
+    yield [("Control Domain Breakdown", "section")]
+    yield header(["Control Domain", "Weight %", "Score (1–5)", "Weighted Contribution", "Evidence / Notes"])
     for d in domain_results:
-        contrib = round(d["score"] * (d["weight_pct"]/100.0), 2)
-        ws["A"+str(row)] = d["name"]
-        ws["B"+str(row)] = d["weight_pct"]
-        ws["C"+str(row)] = d["score"]
-        ws["D"+str(row)] = contrib
-        ws["E"+str(row)] = evidence_notes.get(d["name"], "")
-        for col in "ABCDE":
-            ws[col+str(row)].alignment = wrap
-            ws[col+str(row)].border = border
-        row += 1
-
-    row += 2
-
-    ws["A"+str(row)] = "Final Approval / Sign-off"
-    ws["A"+str(row)].font = mid_bold
-    row += 1
-
-    ws["A"+str(row)] = "Reviewer"
-    ws["B"+str(row)] = "Role"
-    ws["C"+str(row)] = "Decision"
-    ws["D"+str(row)] = "Signature / Notes"
-    for col in "ABCD":
-        cell = ws[col+str(row)]
-        cell.font = bold
-        cell.alignment = center
-        cell.border = border
-    row += 1
-
+        yield [
+            (v, "cell")
+            for v in (d["name"], d["weight_pct"], d["score"], d["contribution"], evidence_notes.get(d["name"], ""))
+        ]
+
+    yield []
+    yield []
+    yield [("Final Approval / Sign-off", "section")]
+    yield header(["Reviewer", "Role", "Decision", "Signature / Notes"])
     for ap in approvals:
-        ws["A"+str(row)] = ap.get("reviewer","")
-        ws["B"+str(row)] = ap.get("role","")
-        ws["C"+str(row)] = ap.get("decision","")
-        ws["D"+str(row)] = ap.get("notes","")
-        for col in "ABCD":
-            ws[col+str(row)].alignment = wrap
-            ws[col+str(row)].border = border
-        row += 1
-
-    widths = [("A",32), ("B",16), ("C",14), ("D",22), ("E",44)]
-    for col_letter, w in widths:
-        ws.column_dimensions[col_letter].width = w
-
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
-    safe_org = org.replace(" ", "_")
-    safe_vendor = vendor.replace(" ", "_")
-    filename = f"{safe_org}_{safe_vendor}_assessment.xlsx"
-    out_path = out_dir / filename
+        yield [(ap.get(k, ""), "cell") for k in ("reviewer", "role", "decision", "notes")]
+
+def _save_openpyxl(out_path, rows):
+    # Write-only mode streams rows to disk instead of holding the cell grid
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(_SHEET_TITLE)
+
+    # Column widths must be set before the first row is written
+    for col_idx, w in enumerate(_COLUMN_WIDTHS, start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = w
+
+    def styled(value, style):
+        if style is None:
+            return value
+        cell = WriteOnlyCell(ws, value=value)
+        for attr, obj in _OPENPYXL_STYLES[style].items():
+            setattr(cell, attr, obj)
+        return cell
+
+    for row in rows:
+        ws.append([styled(value, style) for value, style in row])
     wb.save(out_path)
 
+def _save_xlsxwriter(out_path, rows):
+    # constant_memory flushes each row to disk as soon as the next one starts
+    wb = xlsxwriter.Workbook(str(out_path), {"constant_memory": True, "strings_to_numbers": False})
+    ws = wb.add_worksheet(_SHEET_TITLE)
+    formats = {key: wb.add_format(props) for key, props in _XLSXWRITER_FORMATS.items()}
+
+    for col_idx, w in enumerate(_COLUMN_WIDTHS):
+        ws.set_column(col_idx, col_idx, w)
+
+    for row_idx, row in enumerate(rows):
+        for col_idx, (value, style) in enumerate(row):
+            ws.write(row_idx, col_idx, value, formats.get(style))
+    wb.close()
+
+def export_to_excel(org, vendor, assessment_date, likelihood, impact,
+                    total_weighted_score, risk_level, domain_results,
+                    approvals, evidence_notes):
+
+    rows = _assessment_rows(
+        org, vendor, assessment_date, likelihood, impact,
+        total_weighted_score, risk_level, domain_results,
+        approvals, evidence_notes,
+    )
+
+    safe_org = _slug(org)
+    safe_vendor = _slug(vendor)
+    filename = f"{safe_org}_{safe_vendor}_assessment.xlsx"
+    out_path = OUT_DIR / filename
+    if xlsxwriter is not None:
+        _save_xlsxwriter(out_path, rows)
+    else:
+        _save_openpyxl(out_path, rows)
+
     print(f"\n📄 Excel exported: {out_path.resolve()}")
 
 
@@ -257,12 +300,14 @@ def _pretty_print_org_vendors(db, org):
     if org not in db or not db[org]:
         print("No vendors recorded yet.")
         return
+    lines = []
     for v_name, rec in db[org].items():
         w = rec.get("weighted_score", "n/a")
         rl = rec.get("risk_level", "n/a")
         date = rec.get("assessment_date", rec.get("assessed_at", "n/a"))
-        print(f"- {v_name} | score={w} | risk={rl} | last={date}")
-    print("--------------------------------------------------\n")
+        lines.append(f"- {v_name} | score={w} | risk={rl} | last={date}\n")
+    lines.append("--------------------------------------------------\n\n")
+    sys.stdout.write("".join(lines))
 
 def _edit_existing_record(db, org, vendor):
     record = db[org][vendor]
@@ -298,7 +343,6 @@ def _edit_existing_record(db, org, vendor):
     if rerun == "y":
         return "rescore"
 
-    db[org][vendor] = record
     utils.save_vendor_db(db)
     utils.snapshot_history(org, vendor, record)
 
@@ -308,9 +352,22 @@ def _edit_existing_record(db, org, vendor):
 
 # ---------- main workflow ----------
 
-def run(model_name):
+def run(model_name, answers_path=None):
     db = utils.load_vendor_db()
 
+    # Optional {question text: score} file for scripted / replayed scoring;
+    # questions it doesn't cover are still asked interactively
+    answers = {}
+    if answers_path:
+        try:
+            answers = json.loads(Path(answers_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Could not read answers file {answers_path}: {e}")
+            return
+        if not isinstance(answers, dict):
+            print(f"Answers file {answers_path} must map question text to a score.")
+            return
+
     print("\n=== Vendor Assessment Menu ===")
     print("1) Start NEW assessment for a vendor")
     print("2) Update / continue EXISTING vendor")
@@ -325,8 +382,7 @@ def run(model_name):
             return
         print("\nKnown organisations:")
         org_names = _list_orgs(db)
-        for idx, org_name in enumerate(org_names, start=1):
-            print(f"{idx}. {org_name}")
+        print("\n".join(f"{idx}. {org_name}" for idx, org_name in enumerate(org_names, start=1)))
         pick = input("Which organisation number to view? ").strip()
         try:
             pick_idx = int(pick) - 1
@@ -348,8 +404,7 @@ def run(model_name):
 
         print("\nKnown organisations:")
         org_names = _list_orgs(db)
-        for idx, org_name in enumerate(org_names, start=1):
-            print(f"{idx}. {org_name}")
+        print("\n".join(f"{idx}. {org_name}" for idx, org_name in enumerate(org_names, start=1)))
         pick_org = input("Select organisation number: ").strip()
         try:
             org_idx = int(pick_org) - 1
@@ -366,8 +421,7 @@ def run(model_name):
             print("\nNo vendors recorded for that organisation yet.")
             return
         print(f"\nVendors under {org}:")
-        for vidx, vname in enumerate(vendors, start=1):
-            print(f"{vidx}. {vname}")
+        print("\n".join(f"{vidx}. {vname}" for vidx, vname in enumerate(vendors, start=1)))
         pick_vendor = input("Select vendor number: ").strip()
         try:
             vend_idx = int(pick_vendor) - 1
@@ -385,13 +439,19 @@ def run(model_name):
             return
 
         # RESCORE path - preload
-        existing_record = db[org][vendor]
-        service_desc = existing_record.get("service","")
-        owner = existing_record.get("business_owner","")
-        regulator = existing_record.get("regulator","")
-        likelihood = existing_record.get("likelihood","").lower()
-        impact = existing_record.get("impact","").lower()
-        assessor = input("Your name / initials: ").strip() or existing_record.get("assessed_by","")
+        record = db[org][vendor]
+        service_desc = record.get("service","")
+        owner = record.get("business_owner","")
+        regulator = record.get("regulator","")
+        likelihood = record.get("likelihood","").lower()
+        impact = record.get("impact","").lower()
+        assessor = input("Your name / initials: ").strip() or record.get("assessed_by","")
+        # Previous answers become the defaults, so only changed questions need typing
+        prior_scores = {
+            q["question"]: q["score"]
+            for dom in record.get("domains", [])
+            for q in dom.get("questions", [])
+        }
 
     # CANCEL
     elif mode_choice == "4":
@@ -411,6 +471,7 @@ def run(model_name):
                 "vendor_name": vendor,
                 "created": datetime.datetime.now().isoformat(),
             }
+        record = db[org][vendor]
 
         service_desc = input("Describe the service / data handled: ").strip()
         owner = input("Business owner / sponsor: ").strip()
@@ -418,15 +479,17 @@ def run(model_name):
         likelihood = input("Likelihood (low/medium/high): ").strip().lower()
         impact = input("Impact (low/medium/high): ").strip().lower()
         assessor = input("Who is performing this assessment (your name/initials)?: ").strip()
+        prior_scores = {}
 
     # ----- DDQ SCORING -----
     domain_results = []
     for d in TPRM_DOMAINS:
-        domain_score, q_details = score_domain(d)
+        domain_score, q_details = score_domain(d, prior_scores, answers)
         domain_results.append({
             "name": d["name"],
             "weight_pct": d["weight"],
             "score": domain_score,
+            "contribution": round(domain_score * (d["weight"]/100.0), 2),
             "questions": q_details,
         })
 
@@ -435,8 +498,7 @@ def run(model_name):
 
     print("\n===== WEIGHTED RESULT =====")
     for r in domain_results:
-        contrib = round(r["score"] * (r["weight_pct"]/100.0), 2)
-        print(f"- {r['name']}: {r['score']} × {r['weight_pct']}% → {contrib}")
+        print(f"- {r['name']}: {r['score']} × {r['weight_pct']}% → {r['contribution']}")
     print(f"\nTotal Weighted Score (1–5 style): {total_weighted_score}")
     print(f"Overall Risk Level: {risk_level}")
     print(f"Composite % Score (dashboard style): {composite_pct_score}/100\n")
@@ -470,7 +532,7 @@ def run(model_name):
     now_iso = datetime.datetime.now().isoformat()
     today_str = str(datetime.date.today())
 
-    record = db[org][vendor]
+    # record is db[org][vendor] itself, so updating it updates the db
     record.update({
         "assessment_date": today_str,
         "assessed_at": now_iso,
@@ -488,7 +550,6 @@ def run(model_name):
         "approvals": approvals,
     })
 
-    db[org][vendor] = record
     utils.save_vendor_db(db)
     utils.snapshot_history(org, vendor, record)
 
@@ -509,33 +570,30 @@ def run(model_name):
         return
 
     # build narrative text + per-vendor Excel first (for 1 / 3 / 4)
-    narrative_lines = []
-    narrative_lines.append(f"Vendor: {vendor}")
-    narrative_lines.append(f"Organisation: {org}")
-    narrative_lines.append(f"Assessment date: {today_str}")
-    narrative_lines.append(f"Weighted Score: {total_weighted_score}")
-    narrative_lines.append(f"Risk Level: {risk_level}")
-    narrative_lines.append(f"Likelihood: {likelihood} | Impact: {impact}")
-    narrative_lines.append("\nDomain breakdown:")
-    for r in domain_results:
-        narrative_lines.append(
-            f"- {r['name']}: score={r['score']} (weight={r['weight_pct']}%)"
-        )
+    narrative_lines = [
+        f"Vendor: {vendor}",
+        f"Organisation: {org}",
+        f"Assessment date: {today_str}",
+        f"Weighted Score: {total_weighted_score}",
+        f"Risk Level: {risk_level}",
+        f"Likelihood: {likelihood} | Impact: {impact}",
+        "\nDomain breakdown:",
+    ]
+    narrative_lines.extend(
+        f"- {r['name']}: score={r['score']} (weight={r['weight_pct']}%)" for r in domain_results
+    )
     narrative_lines.append("\nEvidence notes:")
-    for dom_name, note in evidence_notes.items():
-        narrative_lines.append(f"* {dom_name}: {note}")
+    narrative_lines.extend(f"* {dom_name}: {note}" for dom_name, note in evidence_notes.items())
     narrative_lines.append("\nApprovals:")
-    for a in approvals:
-        narrative_lines.append(
-            f"- {a['reviewer']} ({a['role']}): {a['decision']} | {a['notes']}"
-        )
-
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
-    safe_org = org.replace(" ", "_")
-    safe_vendor = vendor.replace(" ", "_")
-    txt_path = out_dir / f"{safe_org}_{safe_vendor}_Risk_Assessment.txt"
-    txt_path.write_text("\n".join(narrative_lines), encoding="utf-8")
+    narrative_lines.extend(
+        f"- {a['reviewer']} ({a['role']}): {a['decision']} | {a['notes']}" for a in approvals
+    )
+
+    safe_org = _slug(org)
+    safe_vendor = _slug(vendor)
+    txt_path = OUT_DIR / f"{safe_org}_{safe_vendor}_Risk_Assessment.txt"
+    with txt_path.open("w", encoding="utf-8") as f:
+        f.writelines(f"{line}\n" for line in narrative_lines)
 
     export_to_excel(
         org=org,
@@ -556,15 +614,18 @@ def run(model_name):
 
     # vendor-level treatment snapshot
     if next_action == "3":
-        from . import risk_treatment
         print("\n📊 Generating board / treatment summary for this vendor ...\n")
-        risk_treatment.run_for_single_vendor(org, vendor, model_name)
+        risk_treatment.run_for_single_vendor(org, vendor, model_name, db=db)
 
     # org-level summary across all vendors
     if next_action == "4":
-        from . import risk_treatment
         print(f"\n📊 Generating ORG-LEVEL summary for {org} ...\n")
-        risk_treatment.run_for_org(org, model_name)
+        risk_treatment.run_for_org(org, model_name, db=db)
 
     print("\n✅ Done. Returning to main menu.\n")
     return
+
+
+if __name__ == "__main__":
+    # python -m modules.tprm_ddq [answers.json]
+    run(Config.OLLAMA_MODEL_DEFAULT, answers_path=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -3,20 +3,31 @@ Production-grade utility functions with error handling and logging
 """
 import json
 import csv
+import hashlib
+import io
+import os
+import re
+import marshal
+import shutil
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from pptx import Presentation
-from pptx.util import Pt
 from openpyxl import Workbook
-from docx import Document
 
 from config import Config
 from modules.logger import get_logger, TPRMLogger
 from modules.validators import InputValidator, ValidationError
 
+try:
+    import orjson  # Optional: faster vendor DB load/save
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
 # Use config for paths
@@ -24,6 +35,118 @@ VENDOR_DB_PATH = Config.VENDOR_DB_PATH
 HISTORY_DIR = Config.HISTORY_DIR
 HISTORY_DIR.mkdir(exist_ok=True)
 
+# In-process copy of the vendor DB, keyed on the file's (mtime_ns, size).
+# Held as marshal bytes: callers mutate what they load, and unmarshalling
+# gives each caller a fresh deep copy much faster than copy.deepcopy.
+_DB_CACHE = {"stamp": None, "data": None}
+
+# Latest history snapshot per (safe_org, safe_vendor): (content digest, path)
+_LAST_SNAPSHOT: Dict[tuple, tuple] = {}
+
+# Suffix of a history snapshot file name, e.g. "_2024-07-01_09-30-00.json"
+_SNAPSHOT_SUFFIX = re.compile(r"_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}\.json")
+
+# Write buffer for CSV exports; portfolio feeds can run to many rows
+CSV_BUFFER_SIZE = 1 << 16
+
+# Snapshot file name component: spaces to underscores, unsafe characters dropped
+_SNAPSHOT_NAME_TABLE = str.maketrans(
+    {" ": "_", **{c: None for c in '<>:"|?*'}, **{chr(i): None for i in range(32)}}
+)
+
+# Case-folded name index for resolve(), tied to the same on-disk stamp:
+# {org.casefold(): (org, {vendor.casefold(): vendor})}
+_NAME_INDEX = {"stamp": None, "index": None}
+
+# ---------------- Lazily imported document libraries ----------------
+# python-docx and python-pptx are slow to import and only needed for Word /
+# PowerPoint output, so they are bound on first use rather than at import.
+
+Document = None
+Presentation = None
+Pt = None
+
+def get_docx_document():
+    """Return python-docx's Document class, importing it on first use"""
+    global Document
+    if Document is None:
+        from docx import Document
+    return Document
+
+def _load_pptx():
+    """Bind python-pptx's Presentation and Pt on first use"""
+    global Presentation, Pt
+    if Presentation is None:
+        from pptx import Presentation
+        from pptx.util import Pt
+
+# python-pptx's default template, saved once so later decks skip re-reading it
+_BLANK_PPTX = None
+
+def _new_presentation():
+    """Return a blank Presentation cloned from the cached default template"""
+    global _BLANK_PPTX
+    _load_pptx()
+    if _BLANK_PPTX is None:
+        buf = io.BytesIO()
+        Presentation().save(buf)
+        _BLANK_PPTX = buf.getvalue()
+    return Presentation(io.BytesIO(_BLANK_PPTX))
+
+# Numbered section titles in generated memos, e.g. "3. Business Impact if Unresolved"
+_SECTION_HEADING = re.compile(r"^\d+\.\s")
+
+def add_text_blocks(doc, text: str) -> None:
+    """
+    Append generated text to a Word document, one paragraph per block
+
+    Blocks are separated by blank lines. A block whose first line is a
+    numbered section title gets that line as a level-2 heading.
+
+    Args:
+        doc: python-docx Document
+        text: Model output to append
+    """
+    for block in re.split(r"\n\s*\n", text.strip()):
+        first, _, rest = block.partition("\n")
+        if _SECTION_HEADING.match(first) and len(first) < 120:
+            doc.add_heading(first.strip(), level=2)
+            block = rest
+        if block.strip():
+            doc.add_paragraph(block.strip())
+
+# ---------------- JSON (de)serialisation ----------------
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialise to 2-space indented UTF-8 JSON bytes (same layout either way)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def write_json_file(path: Path, obj: Any) -> None:
+    """
+    Write obj to path as 2-space indented UTF-8 JSON
+
+    Uses orjson when available; otherwise streams through json.dump so the
+    whole document is never held in memory as one string.
+
+    Args:
+        path: Destination file
+        obj: JSON-serialisable data
+    """
+    path = Path(path)
+    if orjson is not None:
+        path.write_bytes(_json_dumps(obj))
+        return
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
 # ---------------- Timestamp helper ----------------
 
 def now_iso():
@@ -32,17 +155,22 @@ def now_iso():
 def today_short():
     return datetime.datetime.now().strftime("%Y-%m-%d")
 
+# ---------------- Output directories ----------------
+
+# Directories already created by this process; exports skip the mkdir syscall
+_ENSURED_DIRS = set()
+
+def _ensure_dir(path):
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
 # ---------------- Risk bucket logic (centralised) ----------------
 
-def classify_risk_bucket(likelihood, impact):
-    """
-    likelihood and impact are 'low' / 'medium' / 'high'
-    We'll map to numbers and multiply.
-    """
-    mapping = {"low": 1, "medium": 2, "high": 3}
-    like_score = mapping.get(likelihood, 2)
-    imp_score = mapping.get(impact, 2)
-    product = like_score * imp_score
+_LEVEL_SCORE = {"low": 1, "medium": 2, "high": 3}
+
+def _bucket_for_product(product):
     if product >= 7:
         return "high"
     elif product >= 4:
@@ -50,8 +178,42 @@ def classify_risk_bucket(likelihood, impact):
     else:
         return "low"
 
+# Every (likelihood, impact) pair of known levels, precomputed
+_RISK_BUCKETS = {
+    (like, imp): _bucket_for_product(like_score * imp_score)
+    for like, like_score in _LEVEL_SCORE.items()
+    for imp, imp_score in _LEVEL_SCORE.items()
+}
+
+def classify_risk_bucket(likelihood, impact):
+    """
+    likelihood and impact are 'low' / 'medium' / 'high'
+    We'll map to numbers and multiply; unknown levels count as medium.
+    """
+    bucket = _RISK_BUCKETS.get((likelihood, impact))
+    if bucket is None:
+        bucket = _bucket_for_product(_LEVEL_SCORE.get(likelihood, 2) * _LEVEL_SCORE.get(impact, 2))
+    return bucket
+
 # ---------------- Vendor DB helpers (multi-org aware) ----------------
 
+def _refresh_risk_buckets(db: Dict[str, Any]) -> None:
+    """Recompute every record's risk_bucket from its likelihood and impact"""
+    for vendors in db.values():
+        for record in vendors.values():
+            if isinstance(record, dict) and "likelihood" in record and "impact" in record:
+                record["risk_bucket"] = classify_risk_bucket(record["likelihood"], record["impact"])
+
+def _remember_db(db: Dict[str, Any]) -> None:
+    """Cache db against the current on-disk stamp of the vendor database"""
+    try:
+        st = VENDOR_DB_PATH.stat()
+        _DB_CACHE["data"] = marshal.dumps(db)
+        _DB_CACHE["stamp"] = (st.st_mtime_ns, st.st_size)
+    except (OSError, ValueError):
+        # ValueError: db holds something marshal can't encode; just skip caching
+        _DB_CACHE["stamp"] = _DB_CACHE["data"] = None
+
 def load_vendor_db() -> Dict[str, Any]:
     """
     Load vendor database with error handling and backup
@@ -67,8 +229,15 @@ def load_vendor_db() -> Dict[str, Any]:
         return {}
 
     try:
-        content = VENDOR_DB_PATH.read_text(encoding="utf-8")
-        db = json.loads(content)
+        st = VENDOR_DB_PATH.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        if _DB_CACHE["stamp"] == stamp:
+            logger.debug("Vendor database unchanged on disk, using cached copy")
+            return marshal.loads(_DB_CACHE["data"])
+
+        db = _json_loads(VENDOR_DB_PATH.read_bytes())
+        _refresh_risk_buckets(db)
+        _remember_db(db)
         logger.info(f"Loaded vendor database with {len(db)} organizations")
         return db
 
@@ -80,8 +249,8 @@ def load_vendor_db() -> Dict[str, Any]:
         if backup_path.exists():
             try:
                 logger.info("Attempting to load backup database")
-                content = backup_path.read_text(encoding="utf-8")
-                db = json.loads(content)
+                db = _json_loads(backup_path.read_bytes())
+                _refresh_risk_buckets(db)
                 logger.info("Successfully loaded backup database")
                 return db
             except Exception as backup_error:
@@ -111,19 +280,35 @@ def save_vendor_db(db: Dict[str, Any]) -> None:
         if not isinstance(db, dict):
             raise ValueError("Database must be a dictionary")
 
-        # Create backup of existing database
+        # risk_bucket is derived; keep it in step with likelihood/impact edits
+        _refresh_risk_buckets(db)
+
+        # Serialize to a temp file first so an interrupted write never
+        # leaves a truncated vendors.json behind
+        Config.DATA_DIR.mkdir(exist_ok=True)
+        tmp_path = VENDOR_DB_PATH.with_suffix('.json.tmp')
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps(db))
+            f.flush()
+            # Make the data durable before the rename publishes it
+            os.fsync(f.fileno())
+
+        # Create backup of existing database. Link (or copy) rather than
+        # move it, so vendors.json exists at every point of the save
         if VENDOR_DB_PATH.exists():
             backup_path = VENDOR_DB_PATH.with_suffix('.json.backup')
             try:
-                VENDOR_DB_PATH.replace(backup_path)
+                backup_path.unlink(missing_ok=True)
+                try:
+                    os.link(VENDOR_DB_PATH, backup_path)
+                except OSError:
+                    shutil.copy2(VENDOR_DB_PATH, backup_path)
                 logger.debug("Created database backup")
             except Exception as e:
                 logger.warning(f"Failed to create backup: {e}")
 
-        # Save database
-        Config.DATA_DIR.mkdir(exist_ok=True)
-        content = json.dumps(db, indent=2, ensure_ascii=False)
-        VENDOR_DB_PATH.write_text(content, encoding="utf-8")
+        tmp_path.replace(VENDOR_DB_PATH)
+        _remember_db(db)
 
         logger.info(f"Saved vendor database with {len(db)} organizations")
         TPRMLogger.log_user_action(logger, "save_vendor_db", {"org_count": len(db)})
@@ -137,23 +322,121 @@ def ensure_org(db, org_id):
         db[org_id] = {}
     return db
 
+def _build_name_index(db: Dict[str, Any]) -> Dict[str, tuple]:
+    return {
+        org.casefold(): (org, {vendor.casefold(): vendor for vendor in vendors})
+        for org, vendors in db.items()
+    }
+
+def _name_index(db: Dict[str, Any], refresh: bool = False) -> Dict[str, tuple]:
+    """Return the name index for db, reusing it while the DB file is unchanged"""
+    stamp = _DB_CACHE["stamp"]
+    if refresh or stamp is None or _NAME_INDEX["stamp"] != stamp:
+        _NAME_INDEX["index"] = _build_name_index(db)
+        _NAME_INDEX["stamp"] = stamp
+    return _NAME_INDEX["index"]
+
+def resolve_org(db: Dict[str, Any], org_input: str) -> str:
+    """
+    Resolve a user-typed organisation name, ignoring case
+
+    Args:
+        db: Vendor database
+        org_input: Organisation name as entered
+
+    Returns:
+        Organisation name as stored in the database
+
+    Raises:
+        ValidationError: If no such organisation exists
+    """
+    org_input = org_input.strip()
+    if org_input in db:
+        return org_input
+
+    for refresh in (False, True):
+        # Retry with a fresh index in case db was modified since it was loaded
+        entry = _name_index(db, refresh).get(org_input.casefold())
+        if entry is not None and entry[0] in db:
+            return entry[0]
+
+    raise ValidationError(f"No records for org '{org_input}'.")
+
+def resolve(db: Dict[str, Any], org_input: str, vendor_input: str) -> tuple:
+    """
+    Resolve a user-typed organisation/vendor pair, ignoring case, and enforce
+    the data isolation check on the matched record
+
+    Args:
+        db: Vendor database
+        org_input: Organisation name as entered
+        vendor_input: Vendor name as entered
+
+    Returns:
+        Tuple of (organisation name, vendor name, vendor record)
+
+    Raises:
+        ValidationError: If either name is unknown or the record belongs to
+            a different organisation
+    """
+    org_id = resolve_org(db, org_input)
+    vendors = db[org_id]
+    vendor_input = vendor_input.strip()
+
+    vendor_name = vendor_input if vendor_input in vendors else None
+    if vendor_name is None:
+        for refresh in (False, True):
+            _, folded = _name_index(db, refresh).get(org_id.casefold(), (org_id, {}))
+            candidate = folded.get(vendor_input.casefold())
+            if candidate in vendors:
+                vendor_name = candidate
+                break
+        else:
+            raise ValidationError(f"Vendor '{vendor_input}' not found under org '{org_id}'.")
+
+    record = vendors[vendor_name]
+    if record.get("org_id") != org_id:
+        raise ValidationError("Data isolation check failed. Aborting.")
+
+    return org_id, vendor_name, record
+
 def list_orgs(db):
     return list(db.keys())
 
 def list_vendors_for_org(db, org_id):
     if org_id == "ALL":
         # flatten across all orgs
-        out = []
-        for org, vendors in db.items():
-            for v in vendors:
-                out.append((org, v))
-        return out
+        return [(org, v) for org, vendors in db.items() for v in vendors]
     return [(org_id, v) for v in db.get(org_id, {}).keys()]
 
+def _previous_snapshot(safe_org: str, safe_vendor: str) -> Optional[tuple]:
+    """Return (digest, path) of the newest snapshot for a vendor, if any"""
+    key = (safe_org, safe_vendor)
+    cached = _LAST_SNAPSHOT.get(key)
+    if cached is not None and cached[1].exists():
+        return cached
+
+    prefix = f"{safe_org}_{safe_vendor}"
+    candidates = [
+        p for p in HISTORY_DIR.glob(f"{prefix}_*.json")
+        if _SNAPSHOT_SUFFIX.fullmatch(p.name[len(prefix):])
+    ]
+    if not candidates:
+        return None
+
+    # Timestamped names sort chronologically
+    latest = max(candidates, key=lambda p: p.name)
+    found = (hashlib.blake2b(latest.read_bytes()).digest(), latest)
+    _LAST_SNAPSHOT[key] = found
+    return found
+
 def snapshot_history(org_id: str, vendor_name: str, record_dict: Dict[str, Any]) -> None:
     """
     Write a point-in-time snapshot to /history with timestamp and validation
 
+    When the record is unchanged since the vendor's previous snapshot, the
+    new snapshot is a hard link to that file instead of another full copy.
+
     Args:
         org_id: Organization ID
         vendor_name: Vendor name
@@ -168,16 +451,34 @@ def snapshot_history(org_id: str, vendor_name: str, record_dict: Dict[str, Any])
         vendor_name = InputValidator.validate_vendor_name(vendor_name)
 
         ts = now_iso()
-        safe_org = InputValidator.sanitize_filename(org_id.replace(" ", "_"))
-        safe_vendor = InputValidator.sanitize_filename(vendor_name.replace(" ", "_"))
+        # Validated names contain no unsafe characters or "..", so this gives
+        # the same result as sanitize_filename without running its regexes
+        safe_org = org_id.translate(_SNAPSHOT_NAME_TABLE)
+        safe_vendor = vendor_name.translate(_SNAPSHOT_NAME_TABLE)
 
-        HISTORY_DIR.mkdir(exist_ok=True)
+        _ensure_dir(HISTORY_DIR)
         hist_path = HISTORY_DIR / f"{safe_org}_{safe_vendor}_{ts}.json"
 
-        content = json.dumps(record_dict, indent=2, ensure_ascii=False)
-        hist_path.write_text(content, encoding="utf-8")
+        content = _json_dumps(record_dict)
+        digest = hashlib.blake2b(content).digest()
+
+        previous = _previous_snapshot(safe_org, safe_vendor)
+        linked = False
+        if previous is not None and previous[0] == digest:
+            if previous[1] == hist_path:
+                linked = True  # same second, same content: already on disk
+            else:
+                try:
+                    os.link(previous[1], hist_path)
+                    linked = True
+                except OSError:
+                    pass  # e.g. filesystem without hard links; fall back to a copy
 
-        logger.debug(f"Created history snapshot: {hist_path.name}")
+        if not linked:
+            hist_path.write_bytes(content)
+        _LAST_SNAPSHOT[(safe_org, safe_vendor)] = (digest, hist_path)
+
+        logger.debug(f"Created history snapshot: {hist_path.name}{' (linked)' if linked else ''}")
 
     except ValidationError as e:
         logger.error(f"Validation error in snapshot_history: {e}")
@@ -187,6 +488,87 @@ def snapshot_history(org_id: str, vendor_name: str, record_dict: Dict[str, Any])
         logger.error(f"Failed to create history snapshot: {e}")
         raise RuntimeError(f"Failed to create history snapshot: {e}")
 
+def snapshot_history_bulk(snapshots: List[tuple], max_workers: int = 8) -> None:
+    """
+    Write history snapshots for many vendors, overlapping the file writes
+
+    Snapshot files are independent per vendor, so they are written from a
+    small thread pool. When a vendor appears more than once only its last
+    record is written; earlier ones would share the same timestamped name.
+
+    Args:
+        snapshots: (org_id, vendor_name, record) tuples
+        max_workers: Maximum number of concurrent writers
+
+    Raises:
+        RuntimeError: If any snapshot fails
+    """
+    latest = {(org_id, vendor_name): record for org_id, vendor_name, record in snapshots}
+    if not latest:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(latest))) as pool:
+        # list() re-raises the first snapshot failure here
+        list(pool.map(lambda item: snapshot_history(*item[0], item[1]), latest.items()))
+
+    logger.info(f"Created {len(latest)} history snapshots")
+
+def _acceptance_log_path(org_id: str, vendor_name: str) -> Path:
+    safe_org = InputValidator.sanitize_filename(org_id.replace(" ", "_"))
+    safe_vendor = InputValidator.sanitize_filename(vendor_name.replace(" ", "_"))
+    return Config.ACCEPTANCES_DIR / f"{safe_org}_{safe_vendor}.jsonl"
+
+def append_acceptance(org_id: str, vendor_name: str, entry: Dict[str, Any]) -> None:
+    """
+    Append a risk acceptance to the vendor's JSONL log
+
+    Acceptances (including the full memo text) live outside vendors.json so
+    recording one costs a single append rather than a rewrite of the DB.
+
+    Args:
+        org_id: Organization ID
+        vendor_name: Vendor name
+        entry: Acceptance record to append
+
+    Raises:
+        RuntimeError: If the append fails
+    """
+    try:
+        log_path = _acceptance_log_path(org_id, vendor_name)
+        Config.ACCEPTANCES_DIR.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+        with open(log_path, "ab") as f:
+            f.write(line)
+        logger.debug(f"Appended risk acceptance to {log_path.name}")
+
+    except Exception as e:
+        logger.error(f"Failed to record risk acceptance: {e}")
+        raise RuntimeError(f"Failed to record risk acceptance: {e}")
+
+def load_acceptances(org_id: str, vendor_name: str, record: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Read a vendor's risk acceptances, oldest first
+
+    Args:
+        org_id: Organization ID
+        vendor_name: Vendor name
+        record: Vendor record; entries from its legacy inline
+            "risk_acceptances" list are returned ahead of the log
+
+    Returns:
+        List of acceptance records
+    """
+    entries = list((record or {}).get("risk_acceptances", []))
+    log_path = _acceptance_log_path(org_id, vendor_name)
+    if not log_path.exists():
+        return entries
+
+    with open(log_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                entries.append(_json_loads(line))
+    return entries
+
 def validate_vendor_record(record):
     """
     Minimal sanity checker before generating / exporting.
@@ -199,23 +581,25 @@ def validate_vendor_record(record):
 
 # ---------------- Output format selector with isolation ----------------
 
+# Output format -> keywords that select it, checked in order. Power BI comes
+# before PowerPoint so "powerbi" isn't swallowed by the "power" keyword.
+_FORMAT_KEYWORDS = (
+    ("word", ("word", "doc")),
+    ("pdf", ("pdf",)),
+    ("excel", ("excel", "xls")),
+    ("powerbi", ("bi", "dashboard")),
+    ("ppt", ("power", "ppt", "slide")),
+    ("python", ("py",)),
+)
+
 def ask_output_format():
     fmt = input(
         "Output format (word/pdf/excel/powerpoint/powerbi/python/text): "
     ).strip().lower()
 
-    if "word" in fmt or "doc" in fmt:
-        return "word"
-    if "pdf" in fmt:
-        return "pdf"
-    if "excel" in fmt or "xls" in fmt:
-        return "excel"
-    if "power" in fmt or "ppt" in fmt or "slide" in fmt:
-        return "ppt"
-    if "bi" in fmt or "powerbi" in fmt or "dashboard" in fmt:
-        return "powerbi"
-    if "py" in fmt or "python" in fmt:
-        return "python"
+    for out, keywords in _FORMAT_KEYWORDS:
+        if any(k in fmt for k in keywords):
+            return out
     return "text"
 
 def ask_audience_and_redaction():
@@ -232,10 +616,44 @@ def ask_audience_and_redaction():
 
     return audience, redaction
 
+@contextmanager
+def timed_model_call(call_logger, endpoint: str):
+    """
+    Log the caller-observed duration of a model call, including failures
+
+    Args:
+        call_logger: Logger of the calling module
+        endpoint: Label for the call (e.g. "risk_acceptance/llama3")
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        TPRMLogger.log_api_call(call_logger, endpoint, "failure", time.perf_counter() - started)
+        raise
+    TPRMLogger.log_api_call(call_logger, endpoint, "success", time.perf_counter() - started)
+
+def echo_stream(tokens) -> str:
+    """
+    Print streamed model output as it arrives
+
+    Args:
+        tokens: Iterable of text fragments (e.g. from ask_model_stream)
+
+    Returns:
+        The full text, stripped
+    """
+    chunks = []
+    for token in tokens:
+        print(token, end="", flush=True)
+        chunks.append(token)
+    print()
+    return "".join(chunks).strip()
+
 # ---------------- Portfolio PPT builder ----------------
 
 def create_portfolio_ppt(org_id, db_for_report, summary_dict, outfile):
-    prs = Presentation()
+    prs = _new_presentation()
 
     # Slide 1 - Overview
     s1 = prs.slides.add_slide(prs.slide_layouts[0])
@@ -289,17 +707,31 @@ def create_portfolio_ppt(org_id, db_for_report, summary_dict, outfile):
 
 # ---------------- Individual vendor export ----------------
 
-def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
+# Helvetica 10 uses a 12pt leading; text runs from y=800 down to the 60pt margin
+_PDF_LINES_PER_PAGE = (800 - 60) // 12 + 1
+
+def _draw_text_pages(c, text):
+    """Draw text onto a reportlab canvas, starting a new page every _PDF_LINES_PER_PAGE lines"""
+    lines = text.splitlines()
+    for start in range(0, max(len(lines), 1), _PDF_LINES_PER_PAGE):
+        if start:
+            c.showPage()
+        textobj = c.beginText(40, 800)
+        textobj.setFont("Helvetica", 10)
+        textobj.textLines(lines[start:start + _PDF_LINES_PER_PAGE])
+        c.drawText(textobj)
+
+def export_vendor_document(org_id, vendor_record, narrative_text, fmt, ts=None):
     """
     Exports assessment/report for a single vendor in multiple formats.
     vendor_record is the dict for this (org_id, vendor).
+    ts is the date stamp for file names; batch callers pass one for all exports.
     """
 
     safe_org = vendor_record["org_id"].replace(" ", "_")
     safe_vendor = vendor_record["vendor_name"].replace(" ", "_")
-    ts = today_short()
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
+    ts = ts or today_short()
+    out_dir = _ensure_dir(Path("outputs"))
     base = out_dir / f"{safe_org}_{safe_vendor}_{ts}_assessment"
 
     # Always save baseline .txt (audit trail / reference)
@@ -307,7 +739,7 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
 
     # WORD / DOCX
     if fmt == "word":
-        doc = Document()
+        doc = get_docx_document()()
         doc.add_heading(
             f"{vendor_record['vendor_name']} Vendor Risk Assessment ({vendor_record['org_id']})",
             0
@@ -321,16 +753,7 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
         style = input("PDF style (1=plain text, 2=structured sections): ").strip()
         pdf_path = base.with_suffix(".pdf")
         c = canvas.Canvas(str(pdf_path), pagesize=A4)
-        textobj = c.beginText(40, 800)
-        textobj.setFont("Helvetica", 10)
-        for line in narrative_text.splitlines():
-            textobj.textLine(line)
-            if textobj.getY() < 60:
-                c.drawText(textobj)
-                c.showPage()
-                textobj = c.beginText(40, 800)
-                textobj.setFont("Helvetica", 10)
-        c.drawText(textobj)
+        _draw_text_pages(c, narrative_text)
         if style == "2":
             c.showPage()
             c.drawString(40, 800, "Structured layout / next steps:")
@@ -341,15 +764,15 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
 
     # EXCEL
     elif fmt == "excel":
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Assessment"
-        ws["A1"], ws["B1"] = "Org", vendor_record["org_id"]
-        ws["A2"], ws["B2"] = "Vendor", vendor_record["vendor_name"]
-        ws["A3"], ws["B3"] = "Owner", vendor_record["business_owner"]
-        ws["A4"], ws["B4"] = "Likelihood", vendor_record["likelihood"]
-        ws["A5"], ws["B5"] = "Impact", vendor_record["impact"]
-        ws["A6"], ws["B6"] = "Overall Control Score", vendor_record["overall_control_score"]
+        # Write-only workbooks stream rows out instead of keeping every cell
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Assessment")
+        ws.append(["Org", vendor_record["org_id"]])
+        ws.append(["Vendor", vendor_record["vendor_name"]])
+        ws.append(["Owner", vendor_record["business_owner"]])
+        ws.append(["Likelihood", vendor_record["likelihood"]])
+        ws.append(["Impact", vendor_record["impact"]])
+        ws.append(["Overall Control Score", vendor_record["overall_control_score"]])
         ws.append(["Domain", "Score"])
         for d,s in vendor_record["control_scores"].items():
             ws.append([d,s])
@@ -369,7 +792,7 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
     # POWERPOINT
     elif fmt == "ppt":
         kind = input("PowerPoint type (1=Exec summary, 2=Vendor deep dive): ").strip()
-        prs = Presentation()
+        prs = _new_presentation()
 
         # Slide 1: summary
         s1 = prs.slides.add_slide(prs.slide_layouts[0])
@@ -413,15 +836,14 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
 
     # POWER BI FEED
     elif fmt == "powerbi":
-        pbi_dir = Path("outputs/powerbi")
-        pbi_dir.mkdir(exist_ok=True)
+        pbi_dir = _ensure_dir(Path("outputs/powerbi"))
         csv_path = pbi_dir / f"{safe_org}_{safe_vendor}_{ts}.csv"
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(["Org","Vendor","Domain","Score","Overall","Likelihood","Impact","RiskBucket"])
             bucket = classify_risk_bucket(vendor_record["likelihood"], vendor_record["impact"])
-            for d,s in vendor_record["control_scores"].items():
-                writer.writerow([
+            writer.writerows(
+                [
                     vendor_record["org_id"],
                     vendor_record["vendor_name"],
                     d,
@@ -430,14 +852,15 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
                     vendor_record["likelihood"],
                     vendor_record["impact"],
                     bucket
-                ])
+                ]
+                for d, s in vendor_record["control_scores"].items()
+            )
         print("✅ PowerBI CSV created.")
 
     # PYTHON
     elif fmt == "python":
         py_path = base.with_suffix(".py")
-        py_code = "vendor_data = " + json.dumps(vendor_record, indent=2)
-        py_path.write_text(py_code, encoding="utf-8")
+        py_path.write_bytes(b"vendor_data = " + _json_dumps(vendor_record))
         print("✅ Python .py data created.")
 
     # TEXT or fallback
@@ -446,40 +869,40 @@ def export_vendor_document(org_id, vendor_record, narrative_text, fmt):
 
 # ---------------- Portfolio export helpers ----------------
 
-def export_portfolio_artifacts(org_id, db_for_report, summary_dict, narrative_text, fmt):
+def export_portfolio_artifacts(org_id, db_for_report, summary_dict, narrative_text, fmt, ts=None):
     """
     org_id can be a real org name or 'ALL'.
     db_for_report is { vendor_name: vendor_record, ... } for that org.
+    ts is the date stamp for file names; batch callers pass one for all exports.
     """
 
-    ts = today_short()
+    ts = ts or today_short()
     safe_org = org_id.replace(" ", "_")
-    out_dir = Path("outputs")
-    out_dir.mkdir(exist_ok=True)
+    out_dir = _ensure_dir(Path("outputs"))
     base = out_dir / f"Portfolio_{safe_org}_{ts}"
 
     # always write the narrative text
     base.with_suffix(".txt").write_text(narrative_text, encoding="utf-8")
 
     if fmt == "powerbi":
-        powerbi_dir = Path("outputs/powerbi")
-        powerbi_dir.mkdir(exist_ok=True)
+        powerbi_dir = _ensure_dir(Path("outputs/powerbi"))
         csv_path = powerbi_dir / f"portfolio_{safe_org}_{ts}.csv"
-        with open(csv_path,"w",newline="",encoding="utf-8") as f:
+        with open(csv_path,"w",newline="",encoding="utf-8",buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow([
                 "Org","Vendor","OverallControlScore","Likelihood","Impact","RiskBucket"
             ])
-            for vendor_name, v in db_for_report.items():
-                bucket = classify_risk_bucket(v["likelihood"], v["impact"])
-                writer.writerow([
+            writer.writerows(
+                [
                     v["org_id"],
                     v["vendor_name"],
                     v["overall_control_score"],
                     v["likelihood"],
                     v["impact"],
-                    bucket
-                ])
+                    classify_risk_bucket(v["likelihood"], v["impact"])
+                ]
+                for v in db_for_report.values()
+            )
         print(f"Saved PowerBI dataset: {csv_path.resolve()}")
 
     elif fmt == "ppt":
@@ -492,37 +915,38 @@ def export_portfolio_artifacts(org_id, db_for_report, summary_dict, narrative_te
             "summary": summary_dict,
             "vendors": db_for_report
         }
-        py_path.write_text("portfolio_summary = " + json.dumps(py_payload, indent=2),
-                           encoding="utf-8")
+        py_path.write_bytes(b"portfolio_summary = " + _json_dumps(py_payload))
         print(f"Saved Python summary module: {py_path.resolve()}")
 
     elif fmt == "excel":
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Portfolio Summary"
-        ws["A1"] = f"Org: {org_id}"
-        ws["A2"] = f"Total vendors: {summary_dict['total']}"
-        ws["A3"] = f"Avg control score: {summary_dict['avg_control']}"
-        ws["A4"] = f"High risk: {summary_dict['risk_counts']['high']}"
-        ws["A5"] = f"Weakest domain: {summary_dict['weakest_domain']}"
+        # Write-only workbooks stream rows out instead of keeping every cell
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Portfolio Summary")
+        for line in (
+            f"Org: {org_id}",
+            f"Total vendors: {summary_dict['total']}",
+            f"Avg control score: {summary_dict['avg_control']}",
+            f"High risk: {summary_dict['risk_counts']['high']}",
+            f"Weakest domain: {summary_dict['weakest_domain']}",
+        ):
+            ws.append([line])
         ws2 = wb.create_sheet("Vendor Risk")
         ws2.append(["Vendor","Owner","OverallScore","Likelihood","Impact","RiskBucket"])
         for vendor_name, v in db_for_report.items():
-            bucket = classify_risk_bucket(v["likelihood"], v["impact"])
             ws2.append([
                 vendor_name,
                 v["business_owner"],
                 v["overall_control_score"],
                 v["likelihood"],
                 v["impact"],
-                bucket
+                classify_risk_bucket(v["likelihood"], v["impact"])
             ])
         xlsx_path = base.with_suffix(".xlsx")
         wb.save(xlsx_path)
         print(f"Saved Excel workbook: {xlsx_path.resolve()}")
 
     elif fmt == "word":
-        doc = Document()
+        doc = get_docx_document()()
         doc.add_heading(f"Portfolio / Management Report – {org_id}", 0)
         doc.add_paragraph(narrative_text)
         doc.save(base.with_suffix(".docx"))
@@ -531,16 +955,7 @@ def export_portfolio_artifacts(org_id, db_for_report, summary_dict, narrative_te
     elif fmt == "pdf":
         pdf_path = base.with_suffix(".pdf")
         c = canvas.Canvas(str(pdf_path), pagesize=A4)
-        textobj = c.beginText(40, 800)
-        textobj.setFont("Helvetica", 10)
-        for line in narrative_text.splitlines():
-            textobj.textLine(line)
-            if textobj.getY() < 60:
-                c.drawText(textobj)
-                c.showPage()
-                textobj = c.beginText(40, 800)
-                textobj.setFont("Helvetica", 10)
-        c.drawText(textobj)
+        _draw_text_pages(c, narrative_text)
         c.save()
         print(f"Saved PDF report: {pdf_path.resolve()}")
 
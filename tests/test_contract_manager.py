@@ -0,0 +1,65 @@
+"""
+Tests for contract date parsing in modules.contract_manager
+"""
+import datetime
+import unittest
+
+from modules import contract_manager as cm
+
+
+def _unpadded(d: datetime.date) -> str:
+    """Format a date the way older records stored it (no zero padding)"""
+    return f"{d.year}-{d.month}-{d.day}"
+
+
+class ParseYmdTests(unittest.TestCase):
+
+    def test_padded_date(self):
+        self.assertEqual(cm._parse_ymd("2025-01-05"), datetime.date(2025, 1, 5))
+
+    def test_legacy_unpadded_date(self):
+        self.assertEqual(cm._parse_ymd("2025-1-5"), datetime.date(2025, 1, 5))
+        self.assertEqual(cm._validate_iso("2025-1-5"), datetime.date(2025, 1, 5))
+
+    def test_basic_format_rejected(self):
+        with self.assertRaises(ValueError):
+            cm._parse_ymd("20991231")
+        self.assertIsNone(cm._validate_iso("20991231"))
+
+    def test_invalid_dates_rejected(self):
+        for value in ("2025-02-30", "2025-13-01", "2025-W01-1", "", "not a date"):
+            self.assertIsNone(cm._validate_iso(value), value)
+
+
+class ExpiringContractsTests(unittest.TestCase):
+
+    def test_legacy_unpadded_end_date_is_indexed(self):
+        end = datetime.date.today() + datetime.timedelta(days=30)
+        db = {
+            "org": {
+                "Legacy Vendor": {"contract": {"end_date": _unpadded(end)}},
+                "Padded Vendor": {"contract": {"end_date": end.isoformat()}},
+            }
+        }
+
+        expiring = cm.get_expiring_contracts(db, 90, index=cm.build_end_date_index(db))
+
+        self.assertEqual(
+            sorted(c["vendor_name"] for c in expiring),
+            ["Legacy Vendor", "Padded Vendor"],
+        )
+        self.assertTrue(all(c["days_until_expiry"] == 30 for c in expiring))
+
+    def test_default_index_follows_the_given_db(self):
+        end = datetime.date.today() + datetime.timedelta(days=10)
+        first = {"org": {"Old Vendor": {"contract": {"end_date": end.isoformat()}}}}
+        second = {"org": {"New Vendor": {"contract": {"end_date": end.isoformat()}}}}
+
+        cm.get_expiring_contracts(first, 90)
+        expiring = cm.get_expiring_contracts(second, 90)
+
+        self.assertEqual([c["vendor_name"] for c in expiring], ["New Vendor"])
+
+
+if __name__ == "__main__":
+    unittest.main()